@@ -5,14 +5,22 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
-from helpers import (
-    calculate_completion_rate,
-    get_overdue_requests,
-    get_requests_by_team,
-    get_equipment_by_category
+from dates import today_ordinal
+from export import render_export_panel
+from frames import (
+    counts_by,
+    first_created_day,
+    repaired_hours,
+    request_timeline,
+    team_stage_counts
 )
+from helpers import count_overdue_requests, get_equipment_by_category
+from settings import OPEN_STAGES
+from tables import render_equipment_table, render_requests_table
+from profiling import profiled
+from store import get_store
 
+@profiled
 def render():
     """Render the analytics dashboard"""
     
@@ -54,16 +62,17 @@ def render():
     # Detailed tables
     render_detailed_reports()
 
+@profiled
 def render_key_metrics():
     """Render key performance metrics"""
     col1, col2, col3, col4 = st.columns(4)
     
-    total_equipment = len(st.session_state.equipment)
-    total_requests = len(st.session_state.requests)
-    active_requests = len([r for r in st.session_state.requests 
-                          if r['stage'] in ['New', 'In Progress']])
-    completed_requests = len([r for r in st.session_state.requests 
-                             if r['stage'] == 'Repaired'])
+    stage_counts = counts_by('stage')
+    type_counts = counts_by('type')
+    repaired, hours = repaired_hours()
+    total_equipment = len(get_store().equipment)
+    total_requests = int(stage_counts.sum())
+    active_requests = int(stage_counts[list(OPEN_STAGES)].sum())
     
     with col1:
         st.markdown(f"""
@@ -90,7 +99,7 @@ def render_key_metrics():
         """, unsafe_allow_html=True)
     
     with col4:
-        completion_rate = calculate_completion_rate()
+        completion_rate = round(repaired / total_requests * 100, 1) if total_requests else 0
         st.markdown(f"""
         <div class="stat-card" style="background: linear-gradient(135deg, #43e97b 0%, #38f9d7 100%);">
             <div class="stat-card-title">Completion Rate</div>
@@ -102,11 +111,10 @@ def render_key_metrics():
     st.markdown("<br>", unsafe_allow_html=True)
     col1, col2, col3, col4 = st.columns(4)
     
-    overdue = len(get_overdue_requests())
-    preventive = len([r for r in st.session_state.requests if r['type'] == 'Preventive'])
-    corrective = len([r for r in st.session_state.requests if r['type'] == 'Corrective'])
-    avg_duration = round(sum(r.get('duration', 0) for r in st.session_state.requests 
-                            if r['stage'] == 'Repaired') / max(completed_requests, 1), 1)
+    overdue = count_overdue_requests()
+    preventive = int(type_counts['Preventive'])
+    corrective = int(type_counts['Corrective'])
+    avg_duration = round(hours / max(repaired, 1), 1)
     
     with col1:
         st.metric("Overdue Requests", overdue, delta=f"-{overdue}" if overdue > 0 else "0", delta_color="inverse")
@@ -120,13 +128,19 @@ def render_key_metrics():
     with col4:
         st.metric("Avg Duration (hrs)", avg_duration)
 
+@profiled
 def render_requests_by_type_chart():
     """Render requests by type pie chart"""
     st.markdown("### 🔧 Requests by Type")
-    
+    fig = get_store().cached('requests_by_type', build_requests_by_type_figure)
+    st.plotly_chart(fig, use_container_width=True)
+
+def build_requests_by_type_figure():
+    """Pie chart of requests by type"""
+    counts = counts_by('type')
     type_counts = {
-        'Corrective': len([r for r in st.session_state.requests if r['type'] == 'Corrective']),
-        'Preventive': len([r for r in st.session_state.requests if r['type'] == 'Preventive'])
+        'Corrective': int(counts['Corrective']),
+        'Preventive': int(counts['Preventive'])
     }
     
     fig = go.Figure(data=[go.Pie(
@@ -147,14 +161,19 @@ def render_requests_by_type_chart():
         font=dict(family='Outfit', color='#1a1a2e')
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
+@profiled
 def render_requests_by_stage_chart():
     """Render requests by stage bar chart"""
     st.markdown("### 📈 Requests by Stage")
-    
+    fig = get_store().cached('requests_by_stage', build_requests_by_stage_figure)
+    st.plotly_chart(fig, use_container_width=True)
+
+def build_requests_by_stage_figure():
+    """Bar chart of requests by stage"""
     stages = ['New', 'In Progress', 'Repaired', 'Scrap']
-    stage_counts = [len([r for r in st.session_state.requests if r['stage'] == s]) for s in stages]
+    stage_counts = counts_by('stage')[stages].tolist()
     
     colors = ['#ffd43b', '#4ecdc4', '#51cf66', '#ff6b6b']
     
@@ -190,14 +209,19 @@ def render_requests_by_stage_chart():
         font=dict(family='Outfit')
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
+@profiled
 def render_priority_distribution_chart():
     """Render priority distribution chart"""
     st.markdown("### ⚠️ Priority Distribution")
-    
+    fig = get_store().cached('priority_distribution', build_priority_distribution_figure)
+    st.plotly_chart(fig, use_container_width=True)
+
+def build_priority_distribution_figure():
+    """Bar chart of requests by priority"""
     priorities = ['High', 'Medium', 'Low']
-    priority_counts = [len([r for r in st.session_state.requests if r['priority'] == p]) for p in priorities]
+    priority_counts = counts_by('priority')[priorities].tolist()
     
     colors = ['#fa5252', '#ffd43b', '#74c0fc']
     
@@ -232,24 +256,26 @@ def render_priority_distribution_chart():
         )
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
+@profiled
 def render_team_performance_chart():
     """Render team performance chart"""
     st.markdown("### 👥 Team Performance")
-    
-    team_data = []
-    for team in st.session_state.teams:
-        team_requests = get_requests_by_team(team['name'])
-        team_data.append({
-            'Team': team['name'],
-            'Total': len(team_requests),
-            'Completed': len([r for r in team_requests if r['stage'] == 'Repaired']),
-            'In Progress': len([r for r in team_requests if r['stage'] == 'In Progress']),
-            'New': len([r for r in team_requests if r['stage'] == 'New'])
-        })
-    
-    df = pd.DataFrame(team_data)
+    fig = get_store().cached('team_performance', build_team_performance_figure)
+    st.plotly_chart(fig, use_container_width=True)
+
+def build_team_performance_figure():
+    """Stacked bar chart of open and completed work per team"""
+    names = [team['name'] for team in get_store().teams]
+    counts = team_stage_counts(names)
+    df = pd.DataFrame({
+        'Team': names,
+        'Total': counts[['New', 'In Progress', 'Repaired']].sum(axis=1).to_numpy(),
+        'Completed': counts['Repaired'].to_numpy(),
+        'In Progress': counts['In Progress'].to_numpy(),
+        'New': counts['New'].to_numpy()
+    })
     
     fig = go.Figure()
     
@@ -308,39 +334,48 @@ def render_team_performance_chart():
         font=dict(family='Space Mono', size=11, color='white', weight='bold')
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+TIMELINE_RANGES = {'30 Days': 30, 'Quarter': 91, 'Year': 365, 'All Time': None}
+TIMELINE_GRANULARITIES = {'Day': 'D', 'Week': 'W-MON', 'Month': 'MS'}
+BUCKET_NAMES = {'D': 'daily', 'W-MON': 'weekly', 'MS': 'monthly', 'QS': 'quarterly', 'YS': 'yearly'}
 
+@profiled
 def render_requests_timeline():
     """Render requests timeline"""
-    st.markdown("### 📅 Request Timeline (Last 30 Days)")
+    st.markdown("### 📅 Request Timeline")
     
-    # Get requests from last 30 days
-    today = datetime.now()
-    thirty_days_ago = today - timedelta(days=30)
-    
-    timeline_data = []
-    for i in range(30):
-        date = thirty_days_ago + timedelta(days=i)
-        date_str = date.strftime('%Y-%m-%d')
-        count = len([r for r in st.session_state.requests 
-                    if r.get('createdDate') == date_str])
-        timeline_data.append({
-            'Date': date.strftime('%b %d'),
-            'Requests': count
-        })
+    col1, col2 = st.columns(2)
+    with col1:
+        range_label = st.selectbox("Range", list(TIMELINE_RANGES), key="timeline_range")
+    with col2:
+        granularity = st.selectbox("Granularity", list(TIMELINE_GRANULARITIES), key="timeline_granularity")
     
-    df = pd.DataFrame(timeline_data)
+    today = today_ordinal()
+    fig, freq = get_store().cached(
+        ('requests_timeline', today, range_label, granularity),
+        lambda: build_requests_timeline_figure(today, TIMELINE_RANGES[range_label], TIMELINE_GRANULARITIES[granularity])
+    )
+    if freq != TIMELINE_GRANULARITIES[granularity]:
+        st.caption(f"Showing {BUCKET_NAMES[freq]} totals to keep the chart readable.")
+    st.plotly_chart(fig, use_container_width=True)
+
+def build_requests_timeline_figure(today, days, freq):
+    """Line chart of requests created per bucket; returns (figure, frequency used)"""
+    start = today - days + 1 if days else min(first_created_day() or today, today)
+    series, freq = request_timeline(start, today, freq)
     
     fig = go.Figure()
     
     fig.add_trace(go.Scatter(
-        x=df['Date'],
-        y=df['Requests'],
-        mode='lines+markers',
+        x=series.index,
+        y=series.to_numpy(),
+        mode='lines+markers' if len(series) <= 60 else 'lines',
         line=dict(color='#667eea', width=3),
         marker=dict(size=8, color='#764ba2'),
         fill='tozeroy',
-        fillcolor='rgba(102, 126, 234, 0.2)'
+        fillcolor='rgba(102, 126, 234, 0.2)',
+        name='Requests'
     ))
     
     fig.update_layout(
@@ -363,12 +398,17 @@ def render_requests_timeline():
         hovermode='x unified'
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig, freq
 
+@profiled
 def render_equipment_category_chart():
     """Render equipment by category chart"""
     st.markdown("### ⚙️ Equipment by Category")
-    
+    fig = get_store().cached('equipment_category', build_equipment_category_figure)
+    st.plotly_chart(fig, use_container_width=True)
+
+def build_equipment_category_figure():
+    """Pie chart of equipment by category"""
     categories = get_equipment_by_category()
     cat_data = {cat: len(items) for cat, items in categories.items()}
     
@@ -397,64 +437,45 @@ def render_equipment_category_chart():
         )
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
 
+@profiled
 def render_detailed_reports():
     """Render detailed data tables"""
     st.markdown("### 📋 Detailed Reports")
     
+    # Chunked CSV / Parquet / XLSX export of any dataset
+    render_export_panel()
+    
+    store = get_store()
     tab1, tab2, tab3 = st.tabs(["All Requests", "Equipment Status", "Team Workload"])
     
     with tab1:
         st.markdown("#### All Maintenance Requests")
-        df_requests = pd.DataFrame(st.session_state.requests)
-        if not df_requests.empty:
-            df_display = df_requests[[
-                'id', 'subject', 'equipmentName', 'type', 'stage', 
-                'priority', 'scheduledDate', 'assignedTo', 'maintenanceTeam'
-            ]].copy()
-            df_display.columns = [
-                'ID', 'Subject', 'Equipment', 'Type', 'Stage', 
-                'Priority', 'Scheduled', 'Assigned To', 'Team'
-            ]
-            st.dataframe(df_display, use_container_width=True, height=400)
-            
-            # Download button
-            csv = df_display.to_csv(index=False)
-            st.download_button(
-                label="📥 Download Report (CSV)",
-                data=csv,
-                file_name=f"maintenance_requests_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv"
-            )
+        render_requests_table()
     
     with tab2:
         st.markdown("#### Equipment Status Report")
-        df_equipment = pd.DataFrame(st.session_state.equipment)
-        if not df_equipment.empty:
-            df_display = df_equipment[[
-                'id', 'name', 'serialNumber', 'category', 'department', 
-                'location', 'maintenanceTeam', 'status'
-            ]].copy()
-            df_display.columns = [
-                'ID', 'Name', 'Serial Number', 'Category', 'Department',
-                'Location', 'Team', 'Status'
-            ]
-            st.dataframe(df_display, use_container_width=True, height=400)
+        render_equipment_table()
     
     with tab3:
         st.markdown("#### Team Workload Analysis")
-        team_workload = []
-        for team in st.session_state.teams:
-            team_requests = get_requests_by_team(team['name'])
-            team_workload.append({
-                'Team': team['name'],
-                'Members': len(team['members']),
-                'Total Requests': len(team_requests),
-                'Active': len([r for r in team_requests if r['stage'] in ['New', 'In Progress']]),
-                'Completed': len([r for r in team_requests if r['stage'] == 'Repaired']),
-                'Completion Rate': f"{round((len([r for r in team_requests if r['stage'] == 'Repaired']) / max(len(team_requests), 1)) * 100, 1)}%"
-            })
-        
-        df_teams = pd.DataFrame(team_workload)
+        df_teams = store.cached('team_workload_table', build_team_workload_table)
         st.dataframe(df_teams, use_container_width=True, height=300)
+
+def build_team_workload_table():
+    """Request totals and completion rate per team"""
+    teams = get_store().teams
+    names = [team['name'] for team in teams]
+    counts = team_stage_counts(names)
+    total = counts[['New', 'In Progress', 'Repaired']].sum(axis=1).to_numpy()
+    completed = counts['Repaired'].to_numpy()
+    
+    return pd.DataFrame({
+        'Team': names,
+        'Members': [len(team['members']) for team in teams],
+        'Total Requests': total,
+        'Active': counts[list(OPEN_STAGES)].sum(axis=1).to_numpy(),
+        'Completed': completed,
+        'Completion Rate': [f"{round((c / max(t, 1)) * 100, 1)}%" for c, t in zip(completed, total)]
+    })
@@ -0,0 +1,106 @@
+"""
+Automatic technician assignment for GearGuard Pro
+
+A request goes to a member of its maintenance team. The equipment's
+defaultTechnician keeps it unless they already carry more than
+AUTO_ASSIGN_SLACK open requests above the least-loaded member, in which
+case that member gets it. Load is (open requests, estimated open hours),
+taken from the shared workload (see workload.py).
+
+Each team's members sit in a min-heap keyed on load, so assigning N
+requests costs O(N log team size) and a whole backlog is balanced in one
+batch, with every pick seeing the load added by the picks before it.
+"""
+import heapq
+
+from dates import today_ordinal
+from helpers import get_equipment_by_id, get_index, get_team_members, kanban_sort_key, update_request
+from settings import AUTO_ASSIGN_SLACK, OPEN_STAGES
+from workload import get_workload
+
+class AssignmentPlanner:
+    """Least-loaded member lookups that account for the assignments already planned"""
+
+    def __init__(self):
+        self.technicians = get_workload()['technicians']
+        self.loads = {}
+        self._heaps = {}
+
+    def _load(self, member):
+        if member not in self.loads:
+            workload = self.technicians.get(member, {})
+            self.loads[member] = (workload.get('active', 0), workload.get('scheduledHours', 0.0))
+        return self.loads[member]
+
+    def _heap(self, team):
+        heap = self._heaps.get(team)
+        if heap is None:
+            heap = [(*self._load(member), member) for member in dict.fromkeys(get_team_members(team))]
+            heapq.heapify(heap)
+            self._heaps[team] = heap
+        return heap
+
+    def least_loaded(self, team):
+        """The team member with the lowest (open requests, hours), or None for an empty team"""
+        heap = self._heap(team)
+        while heap:
+            open_count, hours, member = heap[0]
+            current = self.loads[member]
+            if current == (open_count, hours):
+                return member
+            # Stale entry: the member took work since it was pushed (possibly
+            # through another team they belong to)
+            heapq.heapreplace(heap, (*current, member))
+        return None
+
+    def choose(self, team, preferred=None, hours=0):
+        """Pick a member of team for a request of the given hours and record the extra load"""
+        least = self.least_loaded(team)
+        if least is None:
+            return None
+        member = least
+        if preferred and preferred != least and preferred in get_team_members(team):
+            if self._load(preferred)[0] <= self.loads[least][0] + AUTO_ASSIGN_SLACK:
+                member = preferred
+        open_count, total = self.loads[member]
+        self.loads[member] = (open_count + 1, total + hours)
+        heapq.heappush(self._heap(team), (*self.loads[member], member))
+        return member
+
+def pick_technician(equipment, hours=0):
+    """The technician auto-assignment would give a new request on this equipment"""
+    if equipment is None:
+        return None
+    return AssignmentPlanner().choose(equipment['maintenanceTeam'], equipment.get('defaultTechnician'), hours)
+
+def auto_assign(requests):
+    """
+    Assign requests in one batch, most urgent first (kanban order).
+
+    New requests move to In Progress, as with a manual assignment. Returns
+    the number of requests assigned; requests whose team has no members
+    are left alone.
+    """
+    planner = AssignmentPlanner()
+    today = today_ordinal()
+    assigned = 0
+    for request in sorted(requests, key=lambda r: kanban_sort_key(r, today)):
+        equipment = get_equipment_by_id(request['equipmentId'])
+        preferred = equipment.get('defaultTechnician') if equipment else None
+        technician = planner.choose(request['maintenanceTeam'], preferred, request.get('duration') or 0)
+        if technician is None:
+            continue
+        changes = {'assignedTo': technician}
+        if request['stage'] == 'New':
+            changes['stage'] = 'In Progress'
+        update_request(request, **changes)
+        assigned += 1
+    return assigned
+
+def get_unassigned_backlog():
+    """Open requests without a technician, in ID order"""
+    return get_index().requests_in_stages('assignedTo', None, OPEN_STAGES)
+
+def rebalance_backlog():
+    """Distribute every unassigned open request across its team; returns how many were assigned"""
+    return auto_assign(get_unassigned_backlog())
@@ -0,0 +1,5 @@
+"""
+Headless benchmarks and load tests for GearGuard Pro
+
+Run from the repository root, e.g. ``python -m benchmarks.run_views``.
+"""
@@ -0,0 +1,209 @@
+"""
+Concurrent session load test for GearGuard Pro
+
+Runs N simulated users against app.py in this process, each in its own
+thread with its own AppTest session, all sharing one data store. Every
+user repeatedly navigates the sidebar, creates requests through the
+kanban and calendar forms and moves kanban cards between stages. Each
+rerun is timed; the report gives p50/p95/p99 latency overall and per
+action, plus process memory growth per session:
+
+    python -m benchmarks.run_load --sessions 8 --iterations 20 --requests 2000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+import storage
+from benchmarks.run_views import APP_PATH
+from benchmarks.synthetic import generate_dataset, write_database
+
+VIEWS = ['kanban', 'calendar', 'equipment', 'teams', 'analytics']
+ACTIONS = ['kanban_form', 'calendar_form', 'move_card']
+
+def rss_bytes():
+    """Resident set size of this process"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        import resource  # not available on Windows
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+def percentiles(samples):
+    """p50/p95/p99 and max in milliseconds"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    cuts = statistics.quantiles(ordered, n=100, method='inclusive') if len(ordered) > 1 else ordered * 99
+    return {
+        'count': len(ordered),
+        'p50_ms': round(cuts[49] * 1000, 1),
+        'p95_ms': round(cuts[94] * 1000, 1),
+        'p99_ms': round(cuts[98] * 1000, 1),
+        'max_ms': round(ordered[-1] * 1000, 1),
+    }
+
+def _find(elements, label=None, key=None):
+    for element in elements:
+        if (key is not None and element.key == key) or (label is not None and element.label == label):
+            return element
+    return None
+
+class SimulatedUser:
+    """One browser session clicking through the app"""
+
+    def __init__(self, number, rng, timeout):
+        self.number = number
+        self.rng = rng
+        self.timeout = timeout
+        self.at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+        self.timings = defaultdict(list)
+        self.errors = []
+
+    def run(self, action, step):
+        """Rerun the app after a widget interaction and record the latency"""
+        started = time.perf_counter()
+        step()
+        self.at.run(timeout=self.timeout)
+        self.timings[action].append(time.perf_counter() - started)
+        for exception in self.at.exception:
+            self.errors.append(f"{action}: {exception.value}")
+
+    def click(self, action, label=None, key=None):
+        button = _find(self.at.button, label=label, key=key)
+        if button is None:
+            self.errors.append(f"{action}: button {label or key!r} not found")
+            return False
+        self.run(action, button.click)
+        return True
+
+    def navigate(self, view):
+        if self.at.session_state.current_view != view:
+            self.click('navigate', key=f"nav_{view}")
+
+    def create_from_kanban(self):
+        self.navigate('kanban')
+        if self.click('kanban_form', label="➕ New Request"):
+            subject = _find(self.at.text_input, label="Subject *")
+            subject.input(f"Load test {self.number}-{len(self.timings['kanban_form'])}")
+            self.click('kanban_form', label="✅ Create Request")
+
+    def create_from_calendar(self):
+        self.navigate('calendar')
+        if self.click('calendar_form', label="➕ Schedule"):
+            subject = _find(self.at.text_input, label="Maintenance Task *")
+            subject.input(f"Load test PM {self.number}-{len(self.timings['calendar_form'])}")
+            self.click('calendar_form', label="✅ Schedule")
+
+    def move_card(self):
+        """Open a card from a column's picker and start or complete it"""
+        self.navigate('kanban')
+        pickers = [sb for sb in self.at.selectbox
+                   if sb.label in ("Open New card", "Open In Progress card") and len(sb.options) > 1]
+        if not pickers:
+            return
+        picker = self.rng.choice(pickers)
+        self.run('open_card', lambda: picker.select_index(self.rng.randrange(1, len(picker.options))))
+        movable = [b for b in self.at.button if b.key and b.key.startswith(('start_', 'repair_'))]
+        if movable:
+            self.run('move_card', movable[0].click)
+
+    def session(self, iterations):
+        self.run('first_load', lambda: None)
+        actions = {
+            'kanban_form': self.create_from_kanban,
+            'calendar_form': self.create_from_calendar,
+            'move_card': self.move_card,
+        }
+        for _ in range(iterations):
+            try:
+                self.navigate(self.rng.choice(VIEWS))
+                actions[self.rng.choice(ACTIONS)]()
+            except Exception as exc:  # keep the other sessions running
+                self.errors.append(f"{type(exc).__name__}: {exc}")
+
+def run_load_test(sessions, iterations, timeout, seed):
+    """Run all sessions concurrently; returns the report dict"""
+    # Load the shared store once so the baseline excludes it
+    AppTest.from_file(str(APP_PATH), default_timeout=timeout).run(timeout=timeout)
+    baseline_rss = rss_bytes()
+
+    users = [SimulatedUser(n, random.Random(seed + n), timeout) for n in range(sessions)]
+    threads = [
+        threading.Thread(target=user.session, args=(iterations,), name=f"load-user-{user.number}")
+        for user in users
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    growth = rss_bytes() - baseline_rss
+
+    by_action = defaultdict(list)
+    for user in users:
+        for action, samples in user.timings.items():
+            by_action[action].extend(samples)
+    every = [s for samples in by_action.values() for s in samples]
+
+    return {
+        'sessions': sessions,
+        'iterations': iterations,
+        'elapsed_s': round(elapsed, 2),
+        'reruns_per_s': round(len(every) / elapsed, 2) if elapsed else None,
+        'latency': percentiles(every),
+        'latency_by_action': {action: percentiles(samples) for action, samples in sorted(by_action.items())},
+        'baseline_rss_mb': round(baseline_rss / 1e6, 1),
+        'memory_growth_mb': round(growth / 1e6, 2),
+        'memory_growth_per_session_mb': round(growth / sessions / 1e6, 2),
+        'errors': [f"session {user.number}: {error}" for user in users for error in user.errors],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent session load test for GearGuard Pro")
+    parser.add_argument('--sessions', type=int, default=8, help='concurrent simulated users')
+    parser.add_argument('--iterations', type=int, default=20, help='actions per user')
+    parser.add_argument('--requests', type=int, default=2_000, help='synthetic dataset size')
+    parser.add_argument('--timeout', type=float, default=120, help='seconds allowed per rerun')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='also write the report to this JSON file')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='gearguard-load-') as workdir:
+        write_database(Path(workdir) / 'load.db', *generate_dataset(args.requests, seed=args.seed))
+        st.cache_resource.clear()
+        report = run_load_test(args.sessions, args.iterations, args.timeout, args.seed)
+        report['requests'] = args.requests
+        st.cache_resource.clear()
+        storage.close_connection()
+
+    latency = report['latency']
+    print(f"{args.sessions} sessions x {args.iterations} actions on {args.requests:,} requests "
+          f"in {report['elapsed_s']}s ({report['reruns_per_s']} reruns/s)")
+    print(f"  all reruns   p50 {latency['p50_ms']:>8} ms  p95 {latency['p95_ms']:>8} ms  p99 {latency['p99_ms']:>8} ms")
+    for action, stats in report['latency_by_action'].items():
+        print(f"  {action:<12} p50 {stats['p50_ms']:>8} ms  p95 {stats['p95_ms']:>8} ms  p99 {stats['p99_ms']:>8} ms")
+    print(f"  memory growth {report['memory_growth_mb']} MB ({report['memory_growth_per_session_mb']} MB per session)")
+    if report['errors']:
+        print(f"  {len(report['errors'])} errors, first: {report['errors'][0]}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    return 1 if report['errors'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Headless view benchmark for GearGuard Pro
+
+Generates a synthetic dataset per size, loads app.py with Streamlit's
+AppTest and reruns it once per view, recording wall time, peak Python
+memory and the number of rendered elements. Results are written as JSON
+so runs from different versions can be compared:
+
+    python -m benchmarks.run_views --sizes 1000 10000 --output bench.json
+    python -m benchmarks.run_views --baseline bench.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.synthetic import generate_dataset, write_database
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_PATH = ROOT / 'app.py'
+VIEWS = ['kanban', 'calendar', 'equipment', 'teams', 'analytics']
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+def count_elements(node):
+    """Count rendered elements below an AppTest node"""
+    children = getattr(node, 'children', None)
+    if not children:
+        return 1
+    values = children.values() if isinstance(children, dict) else children
+    return sum(count_elements(child) for child in values)
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def timed_run(at, timeout):
+    """Run the app once; returns (wall seconds, peak traced bytes)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    at.run(timeout=timeout)
+    wall = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return wall, peak
+
+def benchmark_size(size, views, workdir, timeout, seed):
+    """Benchmark every view against one synthetic dataset"""
+    equipment, teams, requests = generate_dataset(size, seed=seed)
+    write_database(Path(workdir) / f"bench_{size}.db", equipment, teams, requests)
+    del equipment, teams, requests
+    st.cache_resource.clear()
+
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    load_wall, load_peak = timed_run(at, timeout)
+
+    results = []
+    for view in views:
+        at.session_state.current_view = view
+        wall, peak = timed_run(at, timeout)
+        results.append({
+            'requests': size,
+            'view': view,
+            'wall_ms': round(wall * 1000, 1),
+            'peak_mb': round(peak / 1e6, 2),
+            'elements': count_elements(at.main) + count_elements(at.sidebar),
+            'exceptions': [e.value for e in at.exception],
+            'cold_load_ms': round(load_wall * 1000, 1),
+            'cold_load_peak_mb': round(load_peak / 1e6, 2),
+        })
+        print(f"{size:>8,} requests  {view:<10} {results[-1]['wall_ms']:>10.1f} ms "
+              f"{results[-1]['peak_mb']:>8.1f} MB {results[-1]['elements']:>7} elements")
+    return results
+
+def compare(results, baseline_path):
+    """Print wall-time ratios against a previous results file"""
+    baseline = json.loads(Path(baseline_path).read_text())
+    previous = {(r['requests'], r['view']): r for r in baseline['results']}
+    print(f"\nCompared with {baseline_path} ({baseline.get('revision') or 'unknown revision'}):")
+    for r in results:
+        old = previous.get((r['requests'], r['view']))
+        if old and old['wall_ms']:
+            print(f"{r['requests']:>8,} {r['view']:<10} {r['wall_ms'] / old['wall_ms']:>6.2f}x wall  "
+                  f"{r['elements'] - old['elements']:+d} elements")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='request counts to generate')
+    parser.add_argument('--views', nargs='+', default=VIEWS, choices=VIEWS)
+    parser.add_argument('--output', default='bench_results.json', help='JSON results file')
+    parser.add_argument('--baseline', help='previous results file to compare against')
+    parser.add_argument('--timeout', type=float, default=600, help='seconds allowed per rerun')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='gearguard-bench-') as workdir:
+        for size in args.sizes:
+            results.extend(benchmark_size(size, args.views, workdir, args.timeout, args.seed))
+
+    report = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'streamlit': st.__version__,
+        'results': results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"\nWrote {args.output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+if __name__ == '__main__':
+    sys.exit(main())
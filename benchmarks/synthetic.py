@@ -0,0 +1,138 @@
+"""
+Synthetic plant-scale datasets for benchmarking GearGuard Pro
+
+Records follow the schema of sample_data.py. Older work orders are mostly
+closed and recent ones mostly open, so the overdue, calendar and kanban
+views see a realistic mix.
+"""
+import os
+import random
+from datetime import datetime, timedelta
+
+import storage
+
+CATEGORIES = ['Production', 'IT Equipment', 'Logistics', 'Facilities', 'Utilities', 'Safety']
+DEPARTMENTS = ['Production', 'Engineering', 'Warehouse', 'IT', 'R&D', 'Maintenance', 'Quality']
+TEAM_KINDS = ['Mechanics', 'Electricians', 'IT Support', 'HVAC Specialists', 'Hydraulics', 'Instrumentation']
+FIRST_NAMES = ['John', 'Jane', 'Robert', 'Mike', 'Sarah', 'David', 'Tom', 'Lisa', 'Chris', 'Andrew',
+               'Emily', 'Maria', 'Ahmed', 'Priya', 'Wei', 'Olga', 'Kofi', 'Lucia', 'Sven', 'Aiko']
+LAST_NAMES = ['Doe', 'Smith', 'Wilson', 'Johnson', 'Lee', 'Brown', 'Garcia', 'Martinez', 'Davis',
+              'Taylor', 'Khan', 'Patel', 'Chen', 'Ivanova', 'Mensah', 'Rossi', 'Berg', 'Sato']
+SUBJECTS = {
+    'Corrective': ['Oil Leak Detected', 'Battery Replacement', 'Motor Overheating', 'Sensor Fault',
+                   'Belt Slipping', 'Unexpected Shutdown', 'Noise From Bearing', 'Network Outage'],
+    'Preventive': ['Monthly Maintenance Check', 'Quarterly Inspection', 'Lubrication Round',
+                   'Filter Replacement', 'Calibration', 'Safety Audit', 'Software Update Required'],
+}
+
+def generate_teams(count, rng):
+    """Teams with 3-10 members each and globally unique member names"""
+    teams = []
+    used = set()
+    for team_id in range(1, count + 1):
+        kind = TEAM_KINDS[(team_id - 1) % len(TEAM_KINDS)]
+        name = kind if team_id <= len(TEAM_KINDS) else f"{kind} {(team_id - 1) // len(TEAM_KINDS) + 1}"
+        members = []
+        for _ in range(rng.randint(3, 10)):
+            member = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            if member in used:
+                member = f"{member} {len(used)}"
+            used.add(member)
+            members.append(member)
+        teams.append({'id': team_id, 'name': name, 'members': members})
+    return teams
+
+def generate_equipment(count, teams, rng, today):
+    equipment = []
+    for eq_id in range(1, count + 1):
+        team = rng.choice(teams)
+        category = rng.choice(CATEGORIES)
+        purchased = today - timedelta(days=rng.randint(30, 3650))
+        warranty = purchased + timedelta(days=365 * rng.randint(1, 5))
+        equipment.append({
+            'id': eq_id,
+            'name': f"{category} Asset {eq_id:05d}",
+            'serialNumber': f"{category[:3].upper()}-{purchased.year}-{eq_id:05d}",
+            'category': category,
+            'department': rng.choice(DEPARTMENTS),
+            'owner': rng.choice(DEPARTMENTS),
+            'purchaseDate': purchased.strftime('%Y-%m-%d'),
+            'warranty': warranty.strftime('%Y-%m-%d'),
+            'location': f"Building {chr(65 + eq_id % 6)}, Bay {eq_id % 40 + 1}",
+            'maintenanceTeam': team['name'],
+            'defaultTechnician': rng.choice(team['members']),
+            'status': 'Operational' if rng.random() > 0.02 else 'Scrapped',
+        })
+    return equipment
+
+def _pick_stage(age_days, rng):
+    """Closed work dominates history; the last few weeks are mostly open"""
+    roll = rng.random()
+    if age_days > 45:
+        return 'Repaired' if roll < 0.93 else 'Scrap' if roll < 0.97 else 'In Progress'
+    if age_days > 10:
+        return 'Repaired' if roll < 0.6 else 'In Progress' if roll < 0.85 else 'New'
+    return 'New' if roll < 0.55 else 'In Progress' if roll < 0.9 else 'Repaired'
+
+def generate_requests(count, equipment, teams, rng, today, history_days=1095):
+    members = {team['name']: team['members'] for team in teams}
+    requests = []
+    for request_id in range(1, count + 1):
+        eq = rng.choice(equipment)
+        request_type = 'Preventive' if rng.random() < 0.45 else 'Corrective'
+        age = int(history_days * (rng.random() ** 2))  # skew towards recent work
+        created = today - timedelta(days=age)
+        scheduled = created + timedelta(days=rng.randint(0, 30 if request_type == 'Preventive' else 5))
+        stage = _pick_stage(age, rng)
+        assigned = None
+        if stage != 'New' or rng.random() < 0.2:
+            assigned = rng.choice(members[eq['maintenanceTeam']])
+        requests.append({
+            'id': request_id,
+            'subject': rng.choice(SUBJECTS[request_type]),
+            'equipmentId': eq['id'],
+            'equipmentName': eq['name'],
+            'type': request_type,
+            'stage': stage,
+            'scheduledDate': scheduled.strftime('%Y-%m-%d'),
+            'duration': round(rng.choice([0.5, 1, 1.5, 2, 3, 4, 6, 8]), 1) if stage == 'Repaired' else 0,
+            'assignedTo': assigned,
+            'createdDate': created.strftime('%Y-%m-%d'),
+            'priority': rng.choices(['High', 'Medium', 'Low'], weights=[2, 5, 3])[0],
+            'category': eq['category'],
+            'maintenanceTeam': eq['maintenanceTeam'],
+            'description': f"Synthetic work order {request_id} for {eq['name']}.",
+        })
+    return requests
+
+def generate_dataset(requests, equipment=None, teams=None, seed=0):
+    """
+    Build (equipment, teams, requests) as dicts.
+
+    By default a plant has one asset per 20 requests (at least 20) and one
+    team per 50 assets (between 4 and 40).
+    """
+    rng = random.Random(seed)
+    today = datetime.now()
+    equipment = equipment or max(20, requests // 20)
+    teams = teams or min(40, max(4, equipment // 50))
+
+    team_list = generate_teams(teams, rng)
+    equipment_list = generate_equipment(equipment, team_list, rng, today)
+    request_list = generate_requests(requests, equipment_list, team_list, rng, today)
+    return equipment_list, team_list, request_list
+
+def write_database(path, equipment, teams, requests):
+    """Write a dataset to a fresh database and point GearGuard at it"""
+    storage.close_connection()
+    for suffix in ('', '-wal', '-shm'):
+        candidate = f"{path}{suffix}"
+        if os.path.exists(candidate):
+            os.remove(candidate)
+    os.environ['GEARGUARD_DB'] = str(path)
+    journal = storage.get_journal_path()
+    if journal.exists():
+        journal.unlink()
+    storage.save_many_equipment(equipment)
+    storage.save_many_teams(teams)
+    storage.save_many_requests(requests)
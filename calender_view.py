@@ -2,10 +2,37 @@
 Calendar View for GearGuard Pro - Preventive Maintenance Scheduling
 """
 import streamlit as st
+import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import calendar
-from helpers import get_equipment_by_id, generate_next_id, get_all_technicians
+from html import escape
+from assignment import pick_technician
+from dates import display_date, from_ordinal, today_ordinal
+from leveling import apply_leveling, overload_hours, propose_leveling
+from recurrence import FREQUENCIES, create_schedule, get_projected_occurrences, materialize, materialize_due
+from settings import CLOSED_STAGES, DEFAULT_TASK_HOURS, LEVELING_WINDOW_DAYS, TECHNICIAN_HOURS_PER_DAY
+from helpers import (
+    get_equipment_by_id,
+    generate_next_id,
+    get_roster,
+    get_team_members,
+    add_request,
+    get_requests_scheduled_between
+)
+from profiling import profiled
+from store import get_store
 
+STATUS_COLORS = {
+    'New': '#ffd43b',
+    'In Progress': '#4ecdc4',
+    'Repaired': '#51cf66',
+    'Scrap': '#ff6b6b'
+}
+
+# Leveling periods and their length in days, starting today
+LEVELING_PERIODS = {'Next month': 30, 'Next quarter': 91}
+
+@profiled
 def render():
     """Render the calendar view"""
     
@@ -87,10 +114,15 @@ def render():
     month_end = datetime(st.session_state.calendar_year, st.session_state.calendar_month, 
                         calendar.monthrange(st.session_state.calendar_year, st.session_state.calendar_month)[1])
     
-    month_requests = [r for r in st.session_state.requests 
-                     if r.get('scheduledDate') and r['type'] == 'Preventive']
-    month_requests = [r for r in month_requests 
-                     if month_start <= datetime.strptime(r['scheduledDate'], '%Y-%m-%d') <= month_end]
+    # One range query feeds both the month stats and the grid; occurrences of
+    # recurring schedules are expanded for this month only
+    month_requests = [r for r in get_requests_scheduled_between(month_start.toordinal(), month_end.toordinal())
+                     if r['type'] == 'Preventive']
+    projected = get_projected_occurrences(month_start.toordinal(), month_end.toordinal())
+    month_requests += projected
+    requests_by_day = {}
+    for r in month_requests:
+        requests_by_day.setdefault(r['scheduledDay'], []).append(r)
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -105,11 +137,15 @@ def render():
     with col4:
         pending = len([r for r in month_requests if r['stage'] == 'New'])
         st.metric("Pending", pending)
+    if projected:
+        st.caption(f"🔄 Includes {len(projected)} upcoming occurrence(s) of recurring schedules")
     
     st.markdown("---")
     
     # Render calendar
-    render_calendar_grid(st.session_state.calendar_year, st.session_state.calendar_month)
+    render_calendar_grid(st.session_state.calendar_year, st.session_state.calendar_month, requests_by_day)
+    
+    render_leveling_panel()
     
     # Upcoming schedule
     st.markdown("### 📋 Upcoming Preventive Maintenance")
@@ -118,100 +154,166 @@ def render():
     if upcoming:
         for request in upcoming[:5]:  # Show next 5
             render_upcoming_card(request)
+            if request.get('projected'):
+                render_start_occurrence(request)
     else:
         st.info("No upcoming preventive maintenance scheduled for the next 30 days.")
 
-def render_calendar_grid(year, month):
-    """Render the calendar grid"""
-    
-    # Get calendar data
-    cal = calendar.monthcalendar(year, month)
+@profiled
+def render_calendar_grid(year, month, requests_by_day):
+    """Render the calendar grid from requests grouped by scheduled day ordinal"""
+    st.markdown(calendar_grid_html(year, month, requests_by_day), unsafe_allow_html=True)
+
+def calendar_grid_html(year, month, requests_by_day):
+    """Build the whole month grid as a single HTML document"""
+    # Get calendar data (weeks start on Sunday, matching the header)
+    cal = calendar.Calendar(firstweekday=calendar.SUNDAY).monthdayscalendar(year, month)
     days_of_week = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+    today = today_ordinal()
     
-    # Header row
-    cols = st.columns(7)
-    for idx, day in enumerate(days_of_week):
-        with cols[idx]:
-            st.markdown(f"<div style='text-align: center; font-weight: 700; color: #667eea; padding: 10px; background: #f8f9fa; border-radius: 8px;'>{day}</div>", 
-                       unsafe_allow_html=True)
+    parts = ["<div style='display: grid; grid-template-columns: repeat(7, minmax(0, 1fr)); gap: 8px;'>"]
     
-    st.markdown("<br>", unsafe_allow_html=True)
+    # Header row
+    for day in days_of_week:
+        parts.append(f"<div style='text-align: center; font-weight: 700; color: #667eea; padding: 10px; "
+                     f"background: #f8f9fa; border-radius: 8px; margin-bottom: 8px;'>{day}</div>")
     
     # Calendar rows
     for week in cal:
-        cols = st.columns(7)
-        for idx, day in enumerate(week):
-            with cols[idx]:
-                if day == 0:
-                    st.markdown("<div style='min-height: 120px;'></div>", unsafe_allow_html=True)
-                else:
-                    render_calendar_day(year, month, day)
-
-def render_calendar_day(year, month, day):
-    """Render a single calendar day"""
-    date = datetime(year, month, day)
-    date_str = date.strftime('%Y-%m-%d')
-    today = datetime.now().date()
-    
-    # Get requests for this day
-    day_requests = [r for r in st.session_state.requests 
-                   if r.get('scheduledDate') == date_str and r['type'] == 'Preventive']
+        for day in week:
+            if day == 0:
+                parts.append("<div style='min-height: 120px;'></div>")
+            else:
+                ordinal = datetime(year, month, day).toordinal()
+                parts.append(calendar_day_html(day, ordinal, today, requests_by_day.get(ordinal, [])))
     
+    parts.append("</div>")
+    return ''.join(parts)
+
+def calendar_day_html(day, ordinal, today, day_requests):
+    """Build the HTML for a single calendar day"""
     # Determine day styling
-    is_today = date.date() == today
-    is_past = date.date() < today
+    is_today = ordinal == today
+    is_past = ordinal < today
     
     bg_color = "#e0e7ff" if is_today else "#ffffff" if not is_past else "#f8f9fa"
     border_color = "#667eea" if is_today else "#e2e8f0"
     
-    st.markdown(f"""
-    <div style='
-        background: {bg_color}; 
-        border: 2px solid {border_color}; 
-        border-radius: 10px; 
-        padding: 10px; 
-        min-height: 120px;
-        position: relative;
-    '>
-        <div style='
-            font-weight: 700; 
-            font-size: 1.2rem; 
-            color: {"#667eea" if is_today else "#1a1a2e"};
-            margin-bottom: 8px;
-        '>{day}</div>
-    """, unsafe_allow_html=True)
+    parts = [
+        f"<div style='background: {bg_color}; border: 2px solid {border_color}; border-radius: 10px; "
+        f"padding: 10px; min-height: 120px; position: relative; overflow: hidden;'>"
+        f"<div style='font-weight: 700; font-size: 1.2rem; color: {'#667eea' if is_today else '#1a1a2e'}; "
+        f"margin-bottom: 8px;'>{day}</div>"
+    ]
     
     # Display requests
     for request in day_requests:
-        status_color = {
-            'New': '#ffd43b',
-            'In Progress': '#4ecdc4',
-            'Repaired': '#51cf66',
-            'Scrap': '#ff6b6b'
-        }.get(request['stage'], '#667eea')
-        
-        st.markdown(f"""
-        <div style='
-            background: {status_color}; 
-            color: white; 
-            padding: 6px 8px; 
-            border-radius: 6px; 
-            font-size: 0.75rem; 
-            margin-bottom: 4px;
-            font-weight: 600;
-            overflow: hidden;
-            text-overflow: ellipsis;
-            white-space: nowrap;
-        ' title='{request["subject"]} - {request["equipmentName"]}'>
-            {request['subject'][:20]}{"..." if len(request['subject']) > 20 else ""}
-        </div>
-        """, unsafe_allow_html=True)
+        status_color = STATUS_COLORS.get(request['stage'], '#667eea')
+        subject = request['subject']
+        short = subject[:20] + ("..." if len(subject) > 20 else "")
+        # Occurrences not created yet are drawn dimmed with a recurrence marker
+        projected = request.get('projected')
+        parts.append(
+            f"<div style='background: {status_color}; color: white; padding: 6px 8px; border-radius: 6px; "
+            f"font-size: 0.75rem; margin-bottom: 4px; font-weight: 600; overflow: hidden; "
+            f"text-overflow: ellipsis; white-space: nowrap;{' opacity: 0.6;' if projected else ''}' "
+            f"title='{escape(subject, quote=True)} - {escape(request['equipmentName'], quote=True)}'>"
+            f"{'🔄 ' if projected else ''}{escape(short)}</div>"
+        )
     
-    st.markdown("</div>", unsafe_allow_html=True)
+    parts.append("</div>")
+    return ''.join(parts)
+
+@profiled
+def render_leveling_panel():
+    """Propose and apply a capacity-leveled preventive schedule for one team"""
+    with st.expander("⚖️ Level Preventive Workload", expanded=False):
+        team_members = get_roster().team_members
+        if not team_members:
+            st.info("Add a team to level its schedule.")
+            return
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            team = st.selectbox("Team", list(team_members), key="level_team")
+        with col2:
+            period = st.selectbox("Period", list(LEVELING_PERIODS), key="level_period")
+        with col3:
+            capacity = st.number_input(
+                "Capacity (hours/day)",
+                min_value=1.0,
+                value=float(max(len(team_members[team]), 1) * TECHNICIAN_HOURS_PER_DAY),
+                step=1.0,
+                key=f"level_capacity_{team}"
+            )
+        with col4:
+            window = st.number_input("Move up to ± days", min_value=0, max_value=14,
+                                     value=LEVELING_WINDOW_DAYS, step=1, key="level_window")
+        
+        if st.button("🔍 Propose Leveled Schedule", key="level_propose", use_container_width=True):
+            today = today_ordinal()
+            with st.spinner("Leveling schedule..."):
+                st.session_state.leveling_proposal = propose_leveling(
+                    team, today, today + LEVELING_PERIODS[period] - 1, capacity, int(window)
+                )
+        
+        proposal = st.session_state.get('leveling_proposal')
+        if not proposal:
+            return
+        
+        before, after, capacity = proposal['before'], proposal['after'], proposal['capacity']
+        st.caption(f"Proposal for {proposal['team']} from {format_date_display(from_ordinal(proposal['startDay']))} "
+                   f"at {capacity:g} hours/day")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            over = overload_hours(after, capacity)
+            st.metric("Hours Over Capacity", round(over, 1),
+                      round(over - overload_hours(before, capacity), 1), delta_color="inverse")
+        with col2:
+            st.metric("Peak Load (h)", round(max(after, default=0), 1),
+                      round(max(after, default=0) - max(before, default=0), 1), delta_color="inverse")
+        with col3:
+            st.metric("Tasks Moved", len(proposal['moves']))
+        
+        st.plotly_chart(build_leveling_figure(proposal), use_container_width=True)
+        
+        if proposal['moves'] and st.button(f"✅ Apply {len(proposal['moves'])} Date Change(s)", key="level_apply",
+                                           use_container_width=True):
+            applied = apply_leveling(proposal)
+            st.session_state.leveling_proposal = None
+            st.success(f"✅ Rescheduled {applied} request(s)")
+            st.rerun()
+
+def build_leveling_figure(proposal):
+    """Daily load before and after leveling against the capacity line"""
+    days = [from_ordinal(proposal['startDay'] + offset) for offset in range(len(proposal['before']))]
+    
+    fig = go.Figure(data=[
+        go.Bar(x=days, y=proposal['before'], name='Before', marker=dict(color='#cbd5e1', line=dict(width=0))),
+        go.Bar(x=days, y=proposal['after'], name='After', marker=dict(color='#667eea', line=dict(width=0))),
+        go.Scatter(x=days, y=[proposal['capacity']] * len(days), name='Capacity', mode='lines',
+                   line=dict(color='#ff6b6b', dash='dash', width=2)),
+    ])
+    
+    fig.update_layout(
+        barmode='group',
+        height=320,
+        margin=dict(l=20, r=20, t=20, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, x=0),
+        xaxis=dict(showgrid=False, title=None, tickfont=dict(family='Outfit', size=11, color='#1a1a2e')),
+        yaxis=dict(showgrid=True, gridcolor='rgba(0,0,0,0.05)', title='Hours',
+                   tickfont=dict(family='Outfit', size=12, color='#64748b')),
+        font=dict(family='Outfit')
+    )
+    
+    return fig
 
+@profiled
 def render_upcoming_card(request):
     """Render an upcoming request card"""
-    days_until = (datetime.strptime(request['scheduledDate'], '%Y-%m-%d') - datetime.now()).days
+    days_until = request['scheduledDay'] - today_ordinal()
     
     urgency_color = "#ff6b6b" if days_until <= 3 else "#ffd43b" if days_until <= 7 else "#51cf66"
     
@@ -248,6 +350,16 @@ def render_upcoming_card(request):
     </div>
     """, unsafe_allow_html=True)
 
+@profiled
+def render_start_occurrence(occurrence):
+    """Button that creates a recurring occurrence's request now and starts it"""
+    if st.button("▶️ Start now", key=f"start_occurrence_{occurrence['scheduleId']}_{occurrence['scheduledDay']}"):
+        schedule = get_store().index.schedule_by_id.get(occurrence['scheduleId'])
+        if schedule is not None:
+            materialize(schedule, occurrence['scheduledDay'], stage='In Progress')
+        st.rerun()
+
+@profiled
 def render_schedule_form():
     """Render the scheduling form"""
     st.markdown("## 📅 Schedule Preventive Maintenance")
@@ -259,7 +371,7 @@ def render_schedule_form():
             subject = st.text_input("Maintenance Task *", placeholder="e.g., Monthly Oil Change")
             
             equipment_options = {eq['id']: f"{eq['name']} ({eq['category']})" 
-                               for eq in st.session_state.equipment}
+                               for eq in get_store().equipment}
             selected_eq_id = st.selectbox(
                 "Equipment *",
                 options=list(equipment_options.keys()),
@@ -270,6 +382,13 @@ def render_schedule_form():
                 "Scheduled Date *",
                 min_value=datetime.now().date()
             )
+            
+            duration = st.number_input(
+                "Estimated Duration (hours)",
+                min_value=0.0,
+                value=float(DEFAULT_TASK_HOURS),
+                step=0.5
+            )
         
         with col2:
             priority = st.selectbox("Priority", ["Medium", "High", "Low"])
@@ -282,16 +401,18 @@ def render_schedule_form():
                 st.text_input("Team", value=selected_eq['maintenanceTeam'], disabled=True)
                 
                 # Technician assignment
-                team_members = []
-                for team in st.session_state.teams:
-                    if team['name'] == selected_eq['maintenanceTeam']:
-                        team_members = team['members']
-                        break
+                team_members = get_team_members(selected_eq['maintenanceTeam'])
                 
                 assign_now = st.checkbox("Assign technician?", value=False)
                 assigned_tech = None
+                auto_assign_tech = False
                 if assign_now and team_members:
-                    assigned_tech = st.selectbox("Technician", options=team_members)
+                    assigned_tech = st.selectbox(
+                        "Technician",
+                        options=[None, *team_members],
+                        format_func=lambda m: "🤖 Auto-assign (least loaded)" if m is None else m
+                    )
+                    auto_assign_tech = assigned_tech is None
         
         description = st.text_area(
             "Description",
@@ -299,13 +420,15 @@ def render_schedule_form():
             height=100
         )
         
-        # Recurrence options (future enhancement placeholder)
-        st.markdown("**🔄 Recurrence** *(Coming Soon)*")
-        col1, col2 = st.columns(2)
+        # Recurring tasks are stored as a rule; requests are created as they fall due
+        st.markdown("**🔄 Recurrence**")
+        col1, col2, col3 = st.columns(3)
         with col1:
-            st.selectbox("Repeat", ["Does not repeat", "Daily", "Weekly", "Monthly", "Yearly"], disabled=True)
+            repeat = st.selectbox("Repeat", ["Does not repeat"] + list(FREQUENCIES))
         with col2:
-            st.number_input("Every", value=1, min_value=1, disabled=True)
+            interval = st.number_input("Every", value=1, min_value=1, step=1)
+        with col3:
+            repeat_until = st.date_input("Until (optional)", value=None, min_value=datetime.now().date())
         
         st.markdown("---")
         col1, col2, col3 = st.columns([1, 1, 2])
@@ -315,17 +438,39 @@ def render_schedule_form():
         with col2:
             cancel = st.form_submit_button("❌ Cancel", use_container_width=True)
         
-        if submit and subject and selected_eq_id:
+        if submit and subject and selected_eq_id and repeat != "Does not repeat":
+            schedule = create_schedule(
+                subject,
+                selected_eq_id,
+                repeat,
+                int(interval),
+                scheduled_date.toordinal(),
+                end_day=repeat_until.toordinal() if repeat_until else None,
+                priority=priority,
+                assigned_to=assigned_tech,
+                duration=duration,
+                description=description,
+                auto_assign=auto_assign_tech
+            )
+            # An occurrence due today becomes a request straight away
+            materialize_due(schedules=[schedule])
+            st.session_state.show_calendar_form = False
+            st.success(f"✅ Recurring maintenance scheduled from {format_date_display(scheduled_date.strftime('%Y-%m-%d'))}")
+            st.rerun()
+        
+        elif submit and subject and selected_eq_id:
             selected_eq = get_equipment_by_id(selected_eq_id)
+            if auto_assign_tech:
+                assigned_tech = pick_technician(selected_eq, duration)
             new_request = {
-                'id': generate_next_id(st.session_state.requests),
+                'id': generate_next_id('requests'),
                 'subject': subject,
                 'equipmentId': selected_eq_id,
                 'equipmentName': selected_eq['name'],
                 'type': 'Preventive',
                 'stage': 'In Progress' if assigned_tech else 'New',
                 'scheduledDate': scheduled_date.strftime('%Y-%m-%d'),
-                'duration': 0,
+                'duration': duration,
                 'assignedTo': assigned_tech,
                 'createdDate': datetime.now().strftime('%Y-%m-%d'),
                 'priority': priority,
@@ -333,7 +478,7 @@ def render_schedule_form():
                 'maintenanceTeam': selected_eq['maintenanceTeam'],
                 'description': description
             }
-            st.session_state.requests.append(new_request)
+            add_request(new_request)
             st.session_state.show_calendar_form = False
             st.success(f"✅ Maintenance scheduled for {format_date_display(scheduled_date.strftime('%Y-%m-%d'))}")
             st.rerun()
@@ -343,24 +488,13 @@ def render_schedule_form():
             st.rerun()
 
 def get_upcoming_preventive_requests():
-    """Get upcoming preventive maintenance requests"""
-    from datetime import timedelta
-    today = datetime.now()
-    future_date = today + timedelta(days=30)
-    
-    upcoming = []
-    for r in st.session_state.requests:
-        if r['type'] == 'Preventive' and r.get('scheduledDate') and r['stage'] not in ['Repaired', 'Scrap']:
-            scheduled = datetime.strptime(r['scheduledDate'], '%Y-%m-%d')
-            if today <= scheduled <= future_date:
-                upcoming.append(r)
-    
-    return sorted(upcoming, key=lambda x: x['scheduledDate'])
+    """Get upcoming preventive maintenance requests and recurring occurrences, by date"""
+    today = today_ordinal()
+    upcoming = [r for r in get_requests_scheduled_between(today + 1, today + 30)
+                if r['type'] == 'Preventive' and r['stage'] not in CLOSED_STAGES]
+    upcoming += get_projected_occurrences(today + 1, today + 30)
+    return sorted(upcoming, key=lambda r: r['scheduledDay'])
 
 def format_date_display(date_str):
     """Format date for display"""
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        return date_obj.strftime('%b %d, %Y')
-    except:
-        return date_str
+    return display_date(date_str)
@@ -0,0 +1,57 @@
+"""
+Date handling for GearGuard Pro
+
+Dates are stored as '%Y-%m-%d' strings for display and persistence, and
+parsed once on ingest into integer day ordinals (date.toordinal()) so
+overdue, upcoming and warranty checks are plain integer comparisons.
+"""
+from datetime import date
+from functools import lru_cache
+
+DATE_FORMAT = '%Y-%m-%d'
+DISPLAY_FORMAT = '%b %d, %Y'
+
+def to_ordinal(date_str):
+    """Parse a '%Y-%m-%d' string into a day ordinal, or None if missing/invalid"""
+    if not date_str:
+        return None
+    try:
+        return date.fromisoformat(date_str).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+def from_ordinal(ordinal):
+    """Convert a day ordinal back to a '%Y-%m-%d' string"""
+    return date.fromordinal(ordinal).strftime(DATE_FORMAT)
+
+def today_ordinal():
+    """Today's date as a day ordinal"""
+    return date.today().toordinal()
+
+@lru_cache(maxsize=8192)
+def display_date(date_str):
+    """Format a '%Y-%m-%d' string for display, returning it unchanged if unparseable"""
+    ordinal = to_ordinal(date_str)
+    if ordinal is None:
+        return date_str
+    return date.fromordinal(ordinal).strftime(DISPLAY_FORMAT)
+
+def attach_request_dates(request):
+    """Store parsed scheduled/created days alongside the date strings"""
+    request['scheduledDay'] = to_ordinal(request.get('scheduledDate'))
+    request['createdDay'] = to_ordinal(request.get('createdDate'))
+    return request
+
+def attach_equipment_dates(equipment):
+    """Store parsed purchase/warranty days alongside the date strings"""
+    equipment['purchaseDay'] = to_ordinal(equipment.get('purchaseDate'))
+    equipment['warrantyDay'] = to_ordinal(equipment.get('warranty'))
+    return equipment
+
+def attach_schedule_dates(schedule):
+    """Store parsed start/end/next days (and the set of started days) alongside the date strings"""
+    schedule['startDay'] = to_ordinal(schedule.get('startDate'))
+    schedule['endDay'] = to_ordinal(schedule.get('endDate'))
+    schedule['nextDay'] = to_ordinal(schedule.get('nextDate'))
+    schedule['startedDays'] = frozenset(to_ordinal(d) for d in schedule.get('startedDates') or ())
+    return schedule
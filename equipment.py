@@ -8,9 +8,16 @@ from helpers import (
     get_warranty_status, 
     format_date,
     generate_next_id,
-    is_overdue
+    is_overdue,
+    get_index,
+    get_team_members,
+    add_equipment
 )
+from settings import OPEN_STAGES
+from profiling import profiled
+from store import get_store
 
+@profiled
 def render():
     """Render the equipment management view"""
     
@@ -33,22 +40,23 @@ def render():
         return
     
     # Filter options
+    all_equipment = get_store().equipment
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        categories = ["All"] + list(set([eq['category'] for eq in st.session_state.equipment]))
+        categories = ["All"] + list(set([eq['category'] for eq in all_equipment]))
         selected_category = st.selectbox("Filter by Category", categories)
     
     with col2:
-        departments = ["All"] + list(set([eq['department'] for eq in st.session_state.equipment]))
+        departments = ["All"] + list(set([eq['department'] for eq in all_equipment]))
         selected_department = st.selectbox("Filter by Department", departments)
     
     with col3:
-        teams = ["All"] + list(set([eq['maintenanceTeam'] for eq in st.session_state.equipment]))
+        teams = ["All"] + list(set([eq['maintenanceTeam'] for eq in all_equipment]))
         selected_team = st.selectbox("Filter by Team", teams)
     
     # Filter equipment
-    filtered_equipment = st.session_state.equipment
+    filtered_equipment = all_equipment
     
     if search_term:
         filtered_equipment = [eq for eq in filtered_equipment 
@@ -76,9 +84,10 @@ def render():
         st.metric("Operational", operational)
     
     with col3:
+        index = get_index()
         with_requests = len([eq for eq in filtered_equipment 
-                           if any(r['equipmentId'] == eq['id'] and r['stage'] in ['New', 'In Progress'] 
-                                 for r in st.session_state.requests)])
+                           if any(index.request_by_id[i]['stage'] in OPEN_STAGES
+                                 for i in index.ids('equipmentId', eq['id']))])
         st.metric("With Pending Tasks", with_requests)
     
     with col4:
@@ -97,6 +106,7 @@ def render():
             with cols[idx % 2]:
                 render_equipment_card(eq)
 
+@profiled
 def render_equipment_card(eq):
     """Render a single equipment card with smart button"""
     
@@ -106,7 +116,7 @@ def render_equipment_card(eq):
     overdue_requests = [r for r in pending_requests if is_overdue(r)]
     
     # Warranty status
-    warranty_status = get_warranty_status(eq['warranty'])
+    warranty_status = get_warranty_status(eq.get('warrantyDay'))
     warranty_color = "#ff6b6b" if "Expired" in warranty_status or "Expiring" in warranty_status else "#51cf66"
     
     # Equipment status color
@@ -253,6 +263,7 @@ def render_equipment_card(eq):
         else:
             st.info("No maintenance history available for this equipment.")
 
+@profiled
 def render_equipment_form():
     """Render the add equipment form"""
     st.markdown("## ➕ Add New Equipment")
@@ -272,12 +283,11 @@ def render_equipment_form():
             warranty = st.date_input("Warranty End Date *", min_value=datetime.now().date())
             location = st.text_input("Location *", placeholder="e.g., Building A, Floor 2")
             
-            team_options = [t['name'] for t in st.session_state.teams]
+            team_options = [t['name'] for t in get_store().teams]
             maintenance_team = st.selectbox("Maintenance Team *", team_options)
             
             # Get team members for default technician
-            selected_team = next((t for t in st.session_state.teams if t['name'] == maintenance_team), None)
-            tech_options = selected_team['members'] if selected_team else []
+            tech_options = list(get_team_members(maintenance_team))
             
             default_tech = st.selectbox("Default Technician *", tech_options if tech_options else ["No team members"])
         
@@ -291,7 +301,7 @@ def render_equipment_form():
         
         if submit and all([name, serial, category, department, owner, location, default_tech]):
             new_equipment = {
-                'id': generate_next_id(st.session_state.equipment),
+                'id': generate_next_id('equipment'),
                 'name': name,
                 'serialNumber': serial,
                 'category': category,
@@ -304,7 +314,7 @@ def render_equipment_form():
                 'defaultTechnician': default_tech,
                 'status': 'Operational'
             }
-            st.session_state.equipment.append(new_equipment)
+            add_equipment(new_equipment)
             st.session_state.show_equipment_form = False
             st.success(f"✅ Equipment '{name}' added successfully!")
             st.rerun()
@@ -0,0 +1,214 @@
+"""
+Report export for GearGuard Pro
+
+Requests, equipment and team workload are exported straight from the
+in-memory store. Rows are produced by a generator and written to a
+temporary file in chunks of EXPORT_CHUNK_ROWS, so a multi-year export
+never materialises the dataset as a DataFrame or a single string.
+
+CSV needs nothing beyond the standard library. Parquet needs pyarrow and
+XLSX needs openpyxl; formats whose library is missing are not offered.
+"""
+import csv
+import importlib.util
+import os
+import tempfile
+from datetime import date, datetime
+from enum import Enum
+from itertools import islice
+
+import streamlit as st
+
+from settings import EXPORT_CHUNK_ROWS, OPEN_STAGES
+from storage import EQUIPMENT_COLUMNS, REQUEST_COLUMNS
+from store import get_store
+
+WORKLOAD_COLUMNS = ['Team', 'Members', 'Total Requests', 'Active', 'Completed', 'Completion Rate']
+
+DATASETS = {
+    'requests': {
+        'label': 'Maintenance Requests',
+        'columns': REQUEST_COLUMNS,
+        'date_fields': {'Scheduled date': 'scheduledDay', 'Created date': 'createdDay'},
+    },
+    'equipment': {
+        'label': 'Equipment',
+        'columns': EQUIPMENT_COLUMNS,
+        'date_fields': {'Purchase date': 'purchaseDay', 'Warranty end': 'warrantyDay'},
+    },
+    'team_workload': {
+        'label': 'Team Workload',
+        'columns': WORKLOAD_COLUMNS,
+        'date_fields': {},
+    },
+}
+
+# Column types for formats with a schema (everything else is a string)
+INTEGER_COLUMNS = {'id', 'equipmentId', 'Members', 'Total Requests', 'Active', 'Completed'}
+FLOAT_COLUMNS = {'duration'}
+
+FORMATS = {
+    'CSV': {'extension': '.csv', 'mime': 'text/csv', 'module': None},
+    'Parquet': {'extension': '.parquet', 'mime': 'application/vnd.apache.parquet', 'module': 'pyarrow'},
+    'Excel (XLSX)': {
+        'extension': '.xlsx',
+        'mime': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        'module': 'openpyxl',
+    },
+}
+
+def available_formats():
+    """Formats whose optional library is installed"""
+    return [name for name, fmt in FORMATS.items()
+            if fmt['module'] is None or importlib.util.find_spec(fmt['module']) is not None]
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, list):
+        return ', '.join(map(str, value))
+    return value
+
+def _team_workload_rows():
+    stats = get_store().stats
+    for team in list(get_store().teams):
+        total = stats.team_count(team['name'], ['New', 'In Progress', 'Repaired'])
+        completed = stats.team_count(team['name'], ['Repaired'])
+        yield {
+            'Team': team['name'],
+            'Members': len(team['members']),
+            'Total Requests': total,
+            'Active': stats.team_count(team['name'], OPEN_STAGES),
+            'Completed': completed,
+            'Completion Rate': f"{round((completed / max(total, 1)) * 100, 1)}%",
+        }
+
+def iter_rows(dataset, columns=None, date_field=None, start_day=None, end_day=None):
+    """
+    Yield export rows as tuples of plain values.
+
+    columns restricts and orders the output; date_field (a day-ordinal field
+    such as 'scheduledDay') with start_day/end_day keeps only records dated
+    within that inclusive range.
+    """
+    columns = columns or DATASETS[dataset]['columns']
+    store = get_store()
+    records = {
+        'requests': lambda: list(store.requests),
+        'equipment': lambda: list(store.equipment),
+        'team_workload': _team_workload_rows,
+    }[dataset]()
+
+    for record in records:
+        if date_field is not None:
+            day = record.get(date_field)
+            if day is None or (start_day is not None and day < start_day) or (end_day is not None and day > end_day):
+                continue
+        yield tuple(_plain(record.get(col)) for col in columns)
+
+def iter_chunks(rows, size=EXPORT_CHUNK_ROWS):
+    """Group an iterator of rows into lists of at most size rows"""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+def write_csv(path, columns, chunks):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for chunk in chunks:
+            writer.writerows(chunk)
+
+def write_parquet(path, columns, chunks):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    def arrow_type(column):
+        if column in INTEGER_COLUMNS:
+            return pa.int64()
+        if column in FLOAT_COLUMNS:
+            return pa.float64()
+        return pa.string()
+
+    schema = pa.schema([(column, arrow_type(column)) for column in columns])
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*chunk), schema)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+
+def write_xlsx(path, columns, chunks):
+    from openpyxl import Workbook
+
+    # Write-only workbooks stream rows to disk instead of keeping cells in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Export')
+    sheet.append(columns)
+    for chunk in chunks:
+        for row in chunk:
+            sheet.append(row)
+    workbook.save(path)
+
+WRITERS = {'CSV': write_csv, 'Parquet': write_parquet, 'Excel (XLSX)': write_xlsx}
+
+def export_to_file(dataset, fmt, columns=None, date_field=None, start_day=None, end_day=None):
+    """Write an export to a new temporary file and return its path"""
+    columns = list(columns or DATASETS[dataset]['columns'])
+    fd, path = tempfile.mkstemp(prefix=f"gearguard_{dataset}_", suffix=FORMATS[fmt]['extension'])
+    os.close(fd)
+    try:
+        rows = iter_rows(dataset, columns, date_field, start_day, end_day)
+        WRITERS[fmt](path, columns, iter_chunks(rows))
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+def render_export_panel():
+    """Export form; each Prepare click writes one file and offers it for download once"""
+    formats = available_formats()
+
+    with st.expander("📥 Export Data", expanded=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            dataset = st.selectbox("Dataset", list(DATASETS), format_func=lambda d: DATASETS[d]['label'],
+                                   key="export_dataset")
+        with col2:
+            fmt = st.selectbox("Format", formats, key="export_format")
+
+        spec = DATASETS[dataset]
+        columns = st.multiselect("Columns", spec['columns'], default=spec['columns'], key=f"export_columns_{dataset}")
+
+        date_field = start_day = end_day = None
+        if spec['date_fields']:
+            col1, col2 = st.columns(2)
+            with col1:
+                field_label = st.selectbox("Filter by", ["No date filter"] + list(spec['date_fields']),
+                                           key=f"export_date_field_{dataset}")
+            if field_label != "No date filter":
+                with col2:
+                    picked = st.date_input("Between", value=(date(date.today().year, 1, 1), date.today()),
+                                           key=f"export_dates_{dataset}")
+                if len(picked) == 2:
+                    date_field = spec['date_fields'][field_label]
+                    start_day, end_day = picked[0].toordinal(), picked[1].toordinal()
+
+        # The file is built only on request, handed to the download button
+        # once and deleted straight away; the next rerun starts from scratch
+        if st.button("⚙️ Prepare Export", key="export_prepare", disabled=not columns, use_container_width=True):
+            with st.spinner("Writing export..."):
+                path = export_to_file(dataset, fmt, columns, date_field, start_day, end_day)
+            name = f"{dataset}_{datetime.now().strftime('%Y%m%d')}{FORMATS[fmt]['extension']}"
+            try:
+                with open(path, 'rb') as f:
+                    st.download_button(
+                        label=f"📥 Download {name}",
+                        data=f,
+                        file_name=name,
+                        mime=FORMATS[fmt]['mime'],
+                        use_container_width=True
+                    )
+            finally:
+                os.remove(path)
@@ -0,0 +1,149 @@
+"""
+Columnar request data for GearGuard Pro
+
+The analytics dashboard reads requests as one pandas DataFrame, rebuilt
+once per store version. Every count it shows comes from a single groupby
+over team, stage, type and priority (see get_request_breakdown), so
+adding a chart does not add another pass over the requests.
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from models import Priority, RequestType, Stage
+from settings import TIMELINE_MAX_POINTS
+from store import get_store
+
+# Low-cardinality columns are stored as categoricals; the enum columns have
+# fixed categories so codes can be assigned with a dict lookup
+CATEGORIES = {
+    'type': [t.value for t in RequestType],
+    'stage': [s.value for s in Stage],
+    'priority': [p.value for p in Priority],
+}
+CATEGORICAL_COLUMNS = ['maintenanceTeam', 'assignedTo', 'category', 'equipmentName']
+OBJECT_COLUMNS = ['subject', 'scheduledDate']
+# Day ordinals are floats so missing dates can be NaN
+NUMERIC_COLUMNS = {'id': np.int64, 'equipmentId': np.int64, 'scheduledDay': np.float64,
+                   'createdDay': np.float64, 'duration': np.float64}
+GROUP_KEYS = ['maintenanceTeam', 'stage', 'type', 'priority']
+
+def _column(records, name):
+    return [getattr(r, name) for r in records]
+
+def build_request_frame(requests):
+    """One row per request (in store order) with the columns the dashboard uses"""
+    data = {}
+    for name, dtype in NUMERIC_COLUMNS.items():
+        data[name] = np.array(_column(requests, name), dtype=dtype)
+    for name, categories in CATEGORIES.items():
+        codes = {value: code for code, value in enumerate(categories)}
+        data[name] = pd.Categorical.from_codes(
+            np.array([codes.get(value, -1) for value in _column(requests, name)], dtype=np.int8),
+            categories=categories
+        )
+    for name in CATEGORICAL_COLUMNS:
+        data[name] = pd.Categorical(_column(requests, name))
+    for name in OBJECT_COLUMNS:
+        data[name] = np.array(_column(requests, name), dtype=object)
+
+    frame = pd.DataFrame(data, copy=False)
+    frame['duration'] = frame['duration'].fillna(0.0)
+    return frame
+
+EQUIPMENT_FRAME_COLUMNS = [
+    'id', 'name', 'serialNumber', 'category', 'department', 'location',
+    'maintenanceTeam', 'status', 'purchaseDate', 'warranty'
+]
+EQUIPMENT_CATEGORICAL_COLUMNS = ['category', 'department', 'maintenanceTeam', 'status']
+
+def build_equipment_frame(equipment):
+    """One row per equipment record (in store order)"""
+    data = {'id': np.array(_column(equipment, 'id'), dtype=np.int64)}
+    for name in ('purchaseDay', 'warrantyDay'):
+        data[name] = np.array(_column(equipment, name), dtype=np.float64)
+    for name in EQUIPMENT_FRAME_COLUMNS[1:]:
+        values = _column(equipment, name)
+        data[name] = pd.Categorical(values) if name in EQUIPMENT_CATEGORICAL_COLUMNS else np.array(values, dtype=object)
+    return pd.DataFrame(data, copy=False)
+
+def build_request_breakdown(frame):
+    """Request count and hours for every team x stage x type x priority combination"""
+    return frame.groupby(GROUP_KEYS, observed=True, dropna=False).agg(
+        requests=('id', 'size'),
+        hours=('duration', 'sum')
+    )
+
+def get_request_frame():
+    """The request DataFrame for the current data version"""
+    store = get_store()
+    return store.cached('request_frame', lambda: build_request_frame(store.requests))
+
+def get_equipment_frame():
+    """The equipment DataFrame for the current data version"""
+    store = get_store()
+    return store.cached('equipment_frame', lambda: build_equipment_frame(store.equipment))
+
+def get_request_breakdown():
+    """The grouped breakdown for the current data version"""
+    return get_store().cached('request_breakdown', lambda: build_request_breakdown(get_request_frame()))
+
+def counts_by(level):
+    """Request counts per value of one breakdown level ('stage', 'type', ...)"""
+    breakdown = get_request_breakdown()
+    counts = breakdown['requests'].groupby(level=level, observed=True).sum()
+    if level in CATEGORIES:
+        counts = counts.reindex(CATEGORIES[level], fill_value=0)
+    return counts
+
+def repaired_hours():
+    """(repaired request count, total hours logged on them)"""
+    breakdown = get_request_breakdown()
+    repaired = breakdown[breakdown.index.get_level_values('stage') == Stage.REPAIRED.value]
+    return int(repaired['requests'].sum()), float(repaired['hours'].sum())
+
+def team_stage_counts(teams):
+    """Teams x stages table of request counts, with a row for every team name given"""
+    counts = (
+        get_request_breakdown()['requests']
+        .groupby(level=['maintenanceTeam', 'stage'], observed=True).sum()
+        .unstack('stage', fill_value=0)
+    )
+    return counts.reindex(index=teams, columns=CATEGORIES['stage'], fill_value=0)
+
+# Timeline buckets from finest to coarsest (pandas offset aliases)
+TIMELINE_FREQUENCIES = ['D', 'W-MON', 'MS', 'QS', 'YS']
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+def get_created_counts():
+    """Requests created per day ordinal, from one value_counts pass per data version"""
+    def build():
+        counts = get_request_frame()['createdDay'].value_counts(dropna=True).sort_index()
+        counts.index = counts.index.astype(np.int64)
+        return counts
+    return get_store().cached('created_counts', build)
+
+def request_timeline(start_day, end_day, freq='D', max_points=TIMELINE_MAX_POINTS):
+    """
+    Requests created per bucket between two day ordinals (inclusive).
+
+    Buckets start on the left edge (weeks start on Monday). If freq would
+    give more than max_points buckets, the next coarser frequency is used.
+    Returns (counts indexed by bucket start timestamp, frequency used).
+    """
+    counts = get_created_counts()
+    counts = counts[(counts.index >= start_day) & (counts.index <= end_day)]
+    daily = counts.reindex(pd.RangeIndex(start_day, end_day + 1), fill_value=0)
+    daily.index = pd.to_datetime(daily.index - EPOCH_ORDINAL, unit='D')
+
+    for candidate in TIMELINE_FREQUENCIES[TIMELINE_FREQUENCIES.index(freq):]:
+        series = daily if candidate == 'D' else daily.resample(candidate, closed='left', label='left').sum()
+        if len(series) <= max_points:
+            break
+    return series, candidate
+
+def first_created_day():
+    """Earliest request creation day ordinal, or None without requests"""
+    counts = get_created_counts()
+    return int(counts.index[0]) if len(counts) else None
@@ -1,87 +1,204 @@
 """
 Helper functions for GearGuard Pro
 """
-import streamlit as st
-from datetime import datetime
+from dates import (
+    attach_equipment_dates,
+    attach_request_dates,
+    attach_schedule_dates,
+    display_date,
+    today_ordinal,
+    to_ordinal
+)
+from models import as_equipment, as_request, as_schedule, as_team
+from settings import OPEN_STAGES, CLOSED_STAGES
+from store import get_store
+from storage import allocate_ids
+
+def get_index():
+    """Get the shared secondary index"""
+    return get_store().index
+
+def get_stats():
+    """Get the shared running request statistics"""
+    return get_store().stats
+
+def add_request(request):
+    """Add a new request (dict or Request), index it and persist it"""
+    request = attach_request_dates(as_request(request))
+    store = get_store()
+    with store.requests_lock:
+        store.requests.append(request)
+        store.index.add_request(request)
+        store.stats.add(request)
+        store.record('requests', 'add', request)
+    store.maybe_compact()
+    return request
+
+def update_request(request, **changes):
+    """Change fields of an existing request and persist it"""
+    if 'scheduledDate' in changes:
+        changes['scheduledDay'] = to_ordinal(changes['scheduledDate'])
+    store = get_store()
+    with store.requests_lock:
+        store.stats.remove(request)
+        store.index.update_request(request, changes)
+        store.stats.add(request)
+        store.record('requests', 'update', request, changes)
+    store.maybe_compact()
+
+def add_equipment(equipment):
+    """Add new equipment (dict or Equipment), index it and persist it"""
+    equipment = attach_equipment_dates(as_equipment(equipment))
+    store = get_store()
+    with store.equipment_lock:
+        store.equipment.append(equipment)
+        store.index.add_equipment(equipment)
+        store.record('equipment', 'add', equipment)
+    store.maybe_compact()
+    return equipment
+
+def update_equipment(equipment, **changes):
+    """Change fields of existing equipment and persist it"""
+    store = get_store()
+    with store.equipment_lock:
+        equipment.update(changes)
+        attach_equipment_dates(equipment)
+        store.record('equipment', 'update', equipment, changes)
+    store.maybe_compact()
+
+def add_team(team):
+    """Add a new team (dict or Team), index it and persist it"""
+    team = as_team(team)
+    store = get_store()
+    with store.teams_lock:
+        store.teams.append(team)
+        store.index.add_team(team)
+        store.record('teams', 'add', team)
+    store.maybe_compact()
+    return team
+
+def update_team(team, **changes):
+    """Change fields of an existing team and persist it"""
+    store = get_store()
+    with store.teams_lock:
+        store.index.update_team(team, changes)
+        store.record('teams', 'update', team, changes)
+    store.maybe_compact()
+
+def add_schedule(schedule):
+    """Add a new recurring schedule (dict or Schedule), index it and persist it"""
+    schedule = attach_schedule_dates(as_schedule(schedule))
+    store = get_store()
+    with store.schedules_lock:
+        store.schedules.append(schedule)
+        store.index.add_schedule(schedule)
+        store.record('schedules', 'add', schedule)
+    store.maybe_compact()
+    return schedule
+
+def update_schedule(schedule, **changes):
+    """Change fields of an existing schedule and persist it"""
+    store = get_store()
+    with store.schedules_lock:
+        schedule.update(changes)
+        attach_schedule_dates(schedule)
+        store.record('schedules', 'update', schedule, changes)
+    store.maybe_compact()
 
 def get_equipment_by_id(eq_id):
     """Get equipment by ID"""
-    for eq in st.session_state.equipment:
-        if eq['id'] == eq_id:
-            return eq
-    return None
+    return get_index().equipment_by_id.get(eq_id)
+
+def get_request_by_id(request_id):
+    """Get a request by ID"""
+    return get_index().request_by_id.get(request_id)
 
 def is_overdue(request):
-    """Check if a request is overdue"""
-    if not request.get('scheduledDate'):
+    """Check if a request is overdue (scheduled today or earlier and still open)"""
+    scheduled = request.get('scheduledDay')
+    if scheduled is None:
         return False
-    scheduled = datetime.strptime(request['scheduledDate'], '%Y-%m-%d')
-    return scheduled < datetime.now() and request['stage'] not in ['Repaired', 'Scrap']
+    return scheduled <= today_ordinal() and request['stage'] not in CLOSED_STAGES
 
 def get_requests_by_equipment(eq_id):
     """Get all requests for a specific equipment"""
-    return [r for r in st.session_state.requests 
-            if r['equipmentId'] == eq_id and r['stage'] != 'Scrap']
+    return get_index().requests('equipmentId', eq_id, exclude_stages=['Scrap'])
+
+def get_requests_by_stage(stage):
+    """Get all requests in a specific stage"""
+    return get_index().requests('stage', stage)
+
+PRIORITY_RANK = {'High': 0, 'Medium': 1, 'Low': 2}
+
+def kanban_sort_key(request, today):
+    """Overdue first, then by priority, then earliest scheduled"""
+    scheduled = request.get('scheduledDay')
+    overdue = scheduled is not None and scheduled <= today and request['stage'] not in CLOSED_STAGES
+    return (not overdue, PRIORITY_RANK.get(request['priority'], len(PRIORITY_RANK)),
+            scheduled if scheduled is not None else float('inf'), request['id'])
+
+def get_top_requests_by_stage(stage, limit):
+    """Get the first limit requests of a stage in kanban order"""
+    return get_index().top_in_stage(stage, limit, kanban_sort_key, today_ordinal())
+
+def count_requests_by_stage(stage):
+    """Count requests in a stage without building the list"""
+    return get_index().count('stage', stage)
 
 def get_team_by_name(team_name):
     """Get team by name"""
-    for team in st.session_state.teams:
-        if team['name'] == team_name:
-            return team
-    return None
+    return get_index().team_by_name.get(team_name)
+
+def get_roster():
+    """Get the cached technician roster"""
+    return get_index().roster()
 
 def get_all_technicians():
-    """Get all technicians from all teams"""
-    technicians = []
-    for team in st.session_state.teams:
-        for member in team['members']:
-            technicians.append({
-                'name': member,
-                'team': team['name']
-            })
-    return technicians
+    """Get all technicians from all teams (shared list, do not modify)"""
+    return get_roster().options
+
+def get_team_members(team_name):
+    """Get the members of a team (empty for an unknown team)"""
+    return get_roster().team_members.get(team_name, ())
 
 def get_requests_by_technician(technician_name):
     """Get all requests assigned to a specific technician"""
-    return [r for r in st.session_state.requests 
-            if r.get('assignedTo') == technician_name and r['stage'] != 'Scrap']
+    return get_index().requests('assignedTo', technician_name, exclude_stages=['Scrap'])
 
 def get_requests_by_team(team_name):
     """Get all requests for a specific team"""
-    return [r for r in st.session_state.requests 
-            if r.get('maintenanceTeam') == team_name and r['stage'] != 'Scrap']
+    return get_index().requests('maintenanceTeam', team_name, exclude_stages=['Scrap'])
 
 def calculate_completion_rate():
     """Calculate completion rate for requests"""
-    total = len(st.session_state.requests)
-    if total == 0:
-        return 0
-    completed = len([r for r in st.session_state.requests if r['stage'] == 'Repaired'])
-    return round((completed / total) * 100, 1)
+    return get_stats().completion_rate()
 
 def get_overdue_requests():
-    """Get all overdue requests"""
-    return [r for r in st.session_state.requests if is_overdue(r)]
+    """Get all overdue requests, oldest first"""
+    return get_index().overdue(today_ordinal())
+
+def count_overdue_requests():
+    """Count overdue requests without building the list"""
+    return get_index().count_overdue(today_ordinal())
 
 def get_upcoming_requests(days=7):
     """Get requests scheduled within the next N days"""
-    from datetime import timedelta
-    today = datetime.now()
-    future_date = today + timedelta(days=days)
-    
-    upcoming = []
-    for r in st.session_state.requests:
-        if r.get('scheduledDate') and r['stage'] not in ['Repaired', 'Scrap']:
-            scheduled = datetime.strptime(r['scheduledDate'], '%Y-%m-%d')
-            if today <= scheduled <= future_date:
-                upcoming.append(r)
-    
-    return sorted(upcoming, key=lambda x: x['scheduledDate'])
+    today = today_ordinal()
+    return [r for r in get_index().scheduled_between(today + 1, today + days)
+            if r['stage'] not in CLOSED_STAGES]
+
+def get_requests_scheduled_between(start_day, end_day):
+    """Get requests scheduled between two day ordinals (inclusive), by date"""
+    return get_index().scheduled_between(start_day, end_day)
+
+def count_requests_scheduled_on(day):
+    """Count requests scheduled on a single day ordinal"""
+    return get_index().schedule.count_between(day, day)
 
 def get_equipment_by_category():
     """Group equipment by category"""
     categories = {}
-    for eq in st.session_state.equipment:
+    for eq in get_store().equipment:
         cat = eq['category']
         if cat not in categories:
             categories[cat] = []
@@ -90,10 +207,11 @@ def get_equipment_by_category():
 
 def get_equipment_with_pending_requests():
     """Get equipment that has pending requests"""
+    index = get_index()
     equipment_with_requests = []
-    for eq in st.session_state.equipment:
-        pending = [r for r in st.session_state.requests 
-                  if r['equipmentId'] == eq['id'] and r['stage'] in ['New', 'In Progress']]
+    for eq in get_store().equipment:
+        pending = [index.request_by_id[i] for i in sorted(index.ids('equipmentId', eq['id']))
+                   if index.request_by_id[i]['stage'] in OPEN_STAGES]
         if pending:
             equipment_with_requests.append({
                 'equipment': eq,
@@ -106,37 +224,25 @@ def format_date(date_str):
     """Format date string for display"""
     if not date_str:
         return "N/A"
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        return date_obj.strftime('%b %d, %Y')
-    except:
-        return date_str
-
-def get_warranty_status(warranty_date):
-    """Check warranty status"""
-    if not warranty_date:
+    return display_date(date_str)
+
+def get_warranty_status(warranty_day):
+    """Check warranty status from the warranty end date's day ordinal"""
+    if warranty_day is None:
         return "Unknown"
     
-    try:
-        warranty = datetime.strptime(warranty_date, '%Y-%m-%d')
-        today = datetime.now()
-        
-        if warranty < today:
-            return "Expired"
-        
-        days_left = (warranty - today).days
-        
-        if days_left <= 30:
-            return f"Expiring Soon ({days_left} days)"
-        elif days_left <= 90:
-            return f"Valid ({days_left} days left)"
-        else:
-            return "Valid"
-    except:
-        return "Unknown"
+    days_left = warranty_day - today_ordinal()
+    
+    if days_left <= 0:
+        return "Expired"
+    
+    if days_left <= 30:
+        return f"Expiring Soon ({days_left} days)"
+    elif days_left <= 90:
+        return f"Valid ({days_left} days left)"
+    else:
+        return "Valid"
 
-def generate_next_id(items):
-    """Generate next available ID"""
-    if not items:
-        return 1
-    return max(item['id'] for item in items) + 1
+def generate_next_id(entity):
+    """Allocate the next ID for 'requests', 'equipment', 'teams' or 'schedules'"""
+    return allocate_ids(entity)[0]
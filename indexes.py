@@ -0,0 +1,278 @@
+"""
+In-memory secondary indexes for GearGuard Pro
+"""
+import heapq
+import threading
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from functools import wraps
+
+from settings import CLOSED_STAGES
+
+class ScheduleIndex:
+    """Request IDs kept sorted by scheduled day for bisect range queries"""
+
+    def __init__(self, entries=()):
+        self._keys = sorted((day, request_id) for day, request_id in entries if day is not None)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, day, request_id):
+        if day is not None:
+            insort(self._keys, (day, request_id))
+
+    def remove(self, day, request_id):
+        if day is None:
+            return
+        pos = bisect_left(self._keys, (day, request_id))
+        if pos < len(self._keys) and self._keys[pos] == (day, request_id):
+            del self._keys[pos]
+
+    def _bounds(self, start, end):
+        lo = 0 if start is None else bisect_left(self._keys, (start,))
+        hi = len(self._keys) if end is None else bisect_left(self._keys, (end + 1,))
+        return lo, hi
+
+    def ids_between(self, start=None, end=None):
+        """IDs scheduled on days start..end inclusive (None = unbounded), by day"""
+        lo, hi = self._bounds(start, end)
+        return [request_id for _, request_id in self._keys[lo:hi]]
+
+    def count_between(self, start=None, end=None):
+        lo, hi = self._bounds(start, end)
+        return hi - lo
+
+    def iter_latest(self):
+        """IDs from the latest scheduled day backwards"""
+        for _, request_id in reversed(self._keys):
+            yield request_id
+
+class Roster:
+    """Team members, each member's teams and the flat technician option list"""
+
+    def __init__(self, teams=()):
+        self.team_members = {}
+        self.member_teams = defaultdict(list)
+        self.options = []
+        for team in teams:
+            members = tuple(team['members'])
+            self.team_members[team['name']] = members
+            for member in members:
+                self.member_teams[member].append(team['name'])
+                self.options.append({'name': member, 'team': team['name']})
+        self.member_teams = dict(self.member_teams)
+
+def _locked(method):
+    """Run an index method while holding the index lock"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+class DataIndex:
+    """
+    Lookup tables over equipment, teams and requests.
+
+    Buckets hold request IDs so a record can move between buckets in O(1)
+    when one of its indexed fields changes. All request mutations must go
+    through add_request/update_request to keep the buckets consistent.
+
+    open_schedule holds only requests in open stages, ordered by scheduled
+    day, so the overdue set for a given day is a single bisect.
+
+    The index is shared between sessions; public methods hold an internal
+    lock so readers never iterate a bucket while another thread changes it.
+    """
+
+    REQUEST_FIELDS = ('equipmentId', 'maintenanceTeam', 'assignedTo', 'stage')
+
+    def __init__(self, equipment=(), teams=(), requests=(), schedules=()):
+        self.equipment_by_id = {}
+        self.team_by_name = {}
+        self.request_by_id = {}
+        self.schedule_by_id = {schedule['id']: schedule for schedule in schedules}
+        self.request_ids = {field: defaultdict(set) for field in self.REQUEST_FIELDS}
+        self.schedule = ScheduleIndex((r.get('scheduledDay'), r['id']) for r in requests)
+        self.open_schedule = ScheduleIndex((r.get('scheduledDay'), r['id']) for r in requests
+                                           if r['stage'] not in CLOSED_STAGES)
+        self.version = 0
+        self.stage_versions = Counter()
+        self._overdue_cache = None
+        self._top_cache = {}
+        self._roster = None
+        self._lock = threading.RLock()
+
+        for eq in equipment:
+            self.add_equipment(eq)
+        for team in teams:
+            self.add_team(team)
+        for request in requests:
+            self._index_request(request)
+
+    # Equipment, teams and schedules
+
+    @_locked
+    def add_equipment(self, equipment):
+        self.equipment_by_id[equipment['id']] = equipment
+
+    @_locked
+    def add_team(self, team):
+        self.team_by_name[team['name']] = team
+        self._roster = None
+
+    @_locked
+    def update_team(self, team, changes):
+        """Apply changes to a team, re-keying it if renamed"""
+        old_name = team['name']
+        team.update(changes)
+        if team['name'] != old_name:
+            self.team_by_name.pop(old_name, None)
+            self.team_by_name[team['name']] = team
+        self._roster = None
+
+    @_locked
+    def roster(self):
+        """The technician roster, rebuilt only after a team is added or changed"""
+        if self._roster is None:
+            self._roster = Roster(self.team_by_name.values())
+        return self._roster
+
+    @_locked
+    def add_schedule(self, schedule):
+        self.schedule_by_id[schedule['id']] = schedule
+
+    # Requests
+
+    @_locked
+    def add_request(self, request):
+        self._index_request(request)
+        self.schedule.add(request.get('scheduledDay'), request['id'])
+        if request['stage'] not in CLOSED_STAGES:
+            self.open_schedule.add(request.get('scheduledDay'), request['id'])
+        self.version += 1
+        self.stage_versions[request['stage']] += 1
+
+    def _index_request(self, request):
+        self.request_by_id[request['id']] = request
+        for field, buckets in self.request_ids.items():
+            buckets[request.get(field)].add(request['id'])
+
+    @_locked
+    def update_request(self, request, changes):
+        """Apply changes to a request and move it between buckets"""
+        was_open = request['stage'] not in CLOSED_STAGES
+        old_stage = request['stage']
+        old_day = request.get('scheduledDay')
+        for field in self.REQUEST_FIELDS:
+            if field in changes and changes[field] != request.get(field):
+                buckets = self.request_ids[field]
+                old = request.get(field)
+                buckets[old].discard(request['id'])
+                if not buckets[old]:
+                    del buckets[old]
+                buckets[changes[field]].add(request['id'])
+        request.update(changes)
+        new_day = request.get('scheduledDay')
+        is_open = request['stage'] not in CLOSED_STAGES
+        if new_day != old_day:
+            self.schedule.remove(old_day, request['id'])
+            self.schedule.add(new_day, request['id'])
+        if new_day != old_day or was_open != is_open:
+            if was_open:
+                self.open_schedule.remove(old_day, request['id'])
+            if is_open:
+                self.open_schedule.add(new_day, request['id'])
+        self.version += 1
+        self.stage_versions[old_stage] += 1
+        self.stage_versions[request['stage']] += 1
+
+    def _ids(self, field, value):
+        return self.request_ids[field].get(value, set())
+
+    @_locked
+    def ids(self, field, value):
+        """Snapshot of the request IDs whose field equals value"""
+        return frozenset(self._ids(field, value))
+
+    @_locked
+    def requests(self, field, value, exclude_stages=()):
+        """Requests whose field equals value, in ID order"""
+        ids = self._ids(field, value)
+        for stage in exclude_stages:
+            ids = ids - self._ids('stage', stage)
+        return [self.request_by_id[i] for i in sorted(ids)]
+
+    @_locked
+    def requests_in_stages(self, field, value, stages):
+        """Requests whose field equals value and whose stage is one of stages, in ID order"""
+        stage_ids = set()
+        for stage in stages:
+            stage_ids |= self._ids(field, value) & self._ids('stage', stage)
+        return [self.request_by_id[i] for i in sorted(stage_ids)]
+
+    @_locked
+    def scheduled_between(self, start=None, end=None):
+        """Requests scheduled on day ordinals start..end inclusive, by scheduled day"""
+        return [self.request_by_id[i] for i in self.schedule.ids_between(start, end)]
+
+    @_locked
+    def overdue(self, today):
+        """Open requests scheduled on or before today, oldest first (memoised per version)"""
+        key = (today, self.version)
+        if self._overdue_cache is None or self._overdue_cache[0] != key:
+            ids = self.open_schedule.ids_between(None, today)
+            self._overdue_cache = (key, [self.request_by_id[i] for i in ids])
+        return self._overdue_cache[1]
+
+    @_locked
+    def top_in_stage(self, stage, limit, sort_key, today):
+        """
+        The first limit requests of a stage ordered by sort_key(request, today).
+
+        Rankings are memoised per stage and day and only recomputed after a
+        request enters, leaves or changes within that stage, so paging
+        through a large closed column costs O(limit) per rerun.
+        """
+        key = (today, self.stage_versions[stage])
+        cached = self._top_cache.get((stage, sort_key))
+        ids = self._ids('stage', stage)
+        if cached is None or cached[0] != key or (len(cached[1]) < limit and len(cached[1]) < len(ids)):
+            ranked = heapq.nsmallest(limit, (self.request_by_id[i] for i in ids),
+                                     key=lambda r: sort_key(r, today))
+            cached = self._top_cache[(stage, sort_key)] = (key, ranked)
+        return cached[1][:limit]
+
+    @_locked
+    def latest_in_stage(self, stage, field, wanted):
+        """
+        The most recently scheduled requests of a stage for several values of field.
+
+        wanted maps each value to how many requests to return for it. The
+        schedule is walked from the latest day backwards and the walk stops
+        once every value has its share, so recent history is enough however
+        long the full history is. Returns {value: [requests, latest first]}.
+        """
+        found = {value: [] for value, limit in wanted.items() if limit > 0}
+        remaining = len(found)
+        stage_ids = self._ids('stage', stage)
+        for request_id in self.schedule.iter_latest():
+            if not remaining:
+                break
+            if request_id not in stage_ids:
+                continue
+            request = self.request_by_id[request_id]
+            bucket = found.get(request.get(field))
+            if bucket is not None and len(bucket) < wanted[request.get(field)]:
+                bucket.append(request)
+                if len(bucket) == wanted[request.get(field)]:
+                    remaining -= 1
+        return found
+
+    @_locked
+    def count_overdue(self, today):
+        return self.open_schedule.count_between(None, today)
+
+    def count(self, field, value):
+        return len(self._ids(field, value))
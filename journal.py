@@ -0,0 +1,73 @@
+"""
+Append-only mutation journal for GearGuard Pro
+
+Every change is written as one compact JSON line:
+
+    {"seq":42,"op":"update","entity":"requests","id":7,"data":{"stage":"Repaired"}}
+
+The SQLite database acts as the snapshot. Compaction writes the changed
+records to it together with the last journal sequence number, then
+truncates the journal, so a cold start loads the snapshot and replays only
+the events after it.
+"""
+import json
+import threading
+
+class Journal:
+    """Sequentially numbered event log backed by a single append-only file"""
+
+    def __init__(self, path, start_seq=0):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.seq = start_seq
+        self.pending = 0
+        for event in self.events(after_seq=start_seq):
+            self.seq = max(self.seq, event['seq'])
+            self.pending += 1
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if self._file.tell() and not self._ends_with_newline():
+            self._file.write('\n')
+
+    def _ends_with_newline(self):
+        with open(self.path, 'rb') as f:
+            f.seek(-1, 2)
+            return f.read(1) == b'\n'
+
+    def events(self, after_seq=0):
+        """Yield events with seq > after_seq, skipping a torn final line"""
+        if not self.path.exists():
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if event['seq'] > after_seq:
+                    yield event
+
+    def append(self, op, entity, record_id, data):
+        """Write one event and return its sequence number"""
+        with self._lock:
+            self.seq += 1
+            line = json.dumps(
+                {'seq': self.seq, 'op': op, 'entity': entity, 'id': record_id, 'data': data},
+                separators=(',', ':'),
+                default=str
+            )
+            self._file.write(line + '\n')
+            self._file.flush()
+            self.pending += 1
+            return self.seq
+
+    def truncate(self):
+        """Drop all events (after they have been captured in a snapshot)"""
+        with self._lock:
+            self._file.close()
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self.pending = 0
+
+    def close(self):
+        with self._lock:
+            self._file.close()
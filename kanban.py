@@ -3,164 +3,259 @@ Kanban Board View for GearGuard Pro
 """
 import streamlit as st
 from datetime import datetime
-from helpers import get_equipment_by_id, is_overdue, get_all_technicians, generate_next_id
+from html import escape
+from dates import display_date
+from helpers import (
+    get_equipment_by_id,
+    get_request_by_id,
+    is_overdue,
+    count_overdue_requests,
+    generate_next_id,
+    get_top_requests_by_stage,
+    count_requests_by_stage,
+    get_team_members,
+    add_request,
+    update_request,
+    update_equipment
+)
+from assignment import auto_assign, pick_technician, rebalance_backlog
+from profiling import profiled
+from settings import KANBAN_PAGE_SIZE
+from store import get_store
+from workload import get_technician_options, get_workload
 
+STAGES = ['New', 'In Progress', 'Repaired', 'Scrap']
+STAGE_EMOJIS = {'New': '🆕', 'In Progress': '⚙️', 'Repaired': '✅', 'Scrap': '🗑️'}
+
+@profiled
 def render():
     """Render the Kanban board view"""
     
-    # Header with action button
-    col1, col2 = st.columns([4, 1])
+    # Header with action buttons
+    col1, col2, col3 = st.columns([3, 1, 1])
     with col1:
         st.markdown("## 🎯 Maintenance Kanban Board")
         st.markdown("*Drag & drop workflow for maintenance requests*")
     with col2:
         if st.button("➕ New Request", use_container_width=True):
             st.session_state.show_request_form = True
+    with col3:
+        rebalance = st.button("🤖 Rebalance Backlog", use_container_width=True,
+                              help="Assign every unassigned open request to the least-loaded team member")
     
     st.markdown("---")
     
+    # The board below is drawn after the batch, so no rerun is needed
+    if rebalance:
+        assigned = rebalance_backlog()
+        if assigned:
+            st.success(f"🤖 Assigned {assigned} request(s) across their teams")
+        else:
+            st.info("No unassigned open requests to distribute.")
+    
     # Show request form
     if st.session_state.get('show_request_form', False):
         render_request_form()
         return
     
     # Display overdue alert
-    overdue_requests = [r for r in st.session_state.requests if is_overdue(r)]
-    if overdue_requests:
+    overdue_count = count_overdue_requests()
+    if overdue_count:
         st.markdown(f"""
         <div class="overdue-alert">
             <span style="font-size: 1.5rem;">⚠️</span>
-            <span><strong>{len(overdue_requests)} Overdue Request(s)</strong> - Immediate attention required!</span>
+            <span><strong>{overdue_count} Overdue Request(s)</strong> - Immediate attention required!</span>
         </div>
         """, unsafe_allow_html=True)
     
-    # Kanban columns
-    stages = ['New', 'In Progress', 'Repaired', 'Scrap']
-    stage_emojis = {'New': '🆕', 'In Progress': '⚙️', 'Repaired': '✅', 'Scrap': '🗑️'}
+    # Kanban columns: one HTML document per column, controls underneath
     cols = st.columns(4)
     
-    for idx, stage in enumerate(stages):
+    for idx, stage in enumerate(STAGES):
         with cols[idx]:
-            stage_requests = [r for r in st.session_state.requests if r['stage'] == stage]
-            
-            # Column header
-            st.markdown(f"""
-            <div class="kanban-column">
-                <div class="kanban-header">
-                    <span>{stage_emojis[stage]} {stage}</span>
-                    <span class="kanban-count">{len(stage_requests)}</span>
-                </div>
-            """, unsafe_allow_html=True)
+            total = count_requests_by_stage(stage)
+            limit = st.session_state.kanban_limits.get(stage, KANBAN_PAGE_SIZE)
+            stage_requests = get_top_requests_by_stage(stage, limit)
             
-            # Display cards
-            for request in stage_requests:
-                render_request_card(request, stage)
-            
-            st.markdown("</div>", unsafe_allow_html=True)
+            st.markdown(render_column_html(stage, stage_requests, total), unsafe_allow_html=True)
+            render_column_controls(stage, stage_requests, total, limit)
+    
+    # Action panel for the card picked in one of the columns
+    render_open_card()
+
+@profiled
+def render_column_html(stage, stage_requests, total):
+    """Build the HTML for a whole kanban column (header, cards and footer)"""
+    parts = [
+        '<div class="kanban-column">',
+        '<div class="kanban-header">',
+        f'<span>{STAGE_EMOJIS[stage]} {stage}</span>',
+        f'<span class="kanban-count">{total}</span>',
+        '</div>',
+    ]
+    parts.extend(request_card_html(request) for request in stage_requests)
+    if total > len(stage_requests):
+        parts.append(f'<p style="color: #64748b; font-size: 0.85rem; text-align: center;">'
+                     f'Showing {len(stage_requests)} of {total}</p>')
+    parts.append('</div>')
+    return ''.join(parts)
 
-def render_request_card(request, stage):
-    """Render a single request card"""
+def request_card_html(request):
+    """Build the HTML for a single request card"""
     overdue = is_overdue(request)
     card_class = "kanban-card overdue" if overdue else "kanban-card"
+    assigned = escape(request['assignedTo']) if request['assignedTo'] else '<em>Unassigned</em>'
+    return (
+        f'<div class="{card_class}">'
+        + ('<div class="overdue-alert" style="padding: 0.5rem; margin-bottom: 0.8rem;">⚠️ OVERDUE</div>' if overdue else '')
+        + f'<h4 class="kanban-card-title">#{request["id"]} {escape(request["subject"])}</h4>'
+        f'<p class="kanban-card-equipment">🔧 {escape(request["equipmentName"])}</p>'
+        f'<div style="margin: 1rem 0;">'
+        f'<span class="badge badge-{request["type"].lower()}">{request["type"]}</span> '
+        f'<span class="badge badge-{request["priority"].lower()}">{request["priority"]}</span>'
+        f'</div>'
+        f'<p style="color: #64748b; font-size: 0.85rem; margin: 0.5rem 0;">'
+        f'📅 Scheduled: {format_date_display(request["scheduledDate"])}</p>'
+        f'<p style="color: #64748b; font-size: 0.85rem; margin: 0.5rem 0;">👤 {assigned}</p>'
+        f'</div>'
+    )
+
+@profiled
+def render_column_controls(stage, stage_requests, total, limit):
+    """Render the card picker and load more / show fewer controls under a column"""
+    open_card = st.session_state.kanban_open_card
+    options = [None] + [r['id'] for r in stage_requests]
+    default = options.index(open_card) if open_card in options else 0
+    subjects = {r['id']: r['subject'] for r in stage_requests}
     
-    # Card content
-    st.markdown(f"""
-    <div class="{card_class}">
-        {f'<div class="overdue-alert" style="padding: 0.5rem; margin-bottom: 0.8rem;">⚠️ OVERDUE</div>' if overdue else ''}
-        <h4 class="kanban-card-title">{request['subject']}</h4>
-        <p class="kanban-card-equipment">🔧 {request['equipmentName']}</p>
-        <div style="margin: 1rem 0;">
-            <span class="badge badge-{request['type'].lower()}">{request['type']}</span>
-            <span class="badge badge-{request['priority'].lower()}">{request['priority']}</span>
-        </div>
-        <p style="color: #64748b; font-size: 0.85rem; margin: 0.5rem 0;">
-            📅 Scheduled: {format_date_display(request['scheduledDate'])}
-        </p>
-        <p style="color: #64748b; font-size: 0.85rem; margin: 0.5rem 0;">
-            👤 {request['assignedTo'] if request['assignedTo'] else '<em>Unassigned</em>'}
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    # No key: the widget resets whenever the open card changes elsewhere
+    choice = st.selectbox(
+        f"Open {stage} card",
+        options=options,
+        index=default,
+        format_func=lambda i: "🔧 Open a card..." if i is None else f"#{i} {subjects[i]}",
+        label_visibility="collapsed"
+    )
+    if choice != options[default]:
+        st.session_state.kanban_open_card = choice
+        st.rerun()
     
-    # Action buttons in expander
-    with st.expander("🔧 Actions & Details", expanded=False):
-        # Show description if available
-        if request.get('description'):
-            st.markdown(f"**Description:** {request['description']}")
-            st.markdown("---")
-        
-        # Assignment section
-        if not request['assignedTo']:
-            st.markdown("**Assign Technician:**")
-            technicians = get_all_technicians()
-            
-            if technicians:
-                tech_options = {f"{t['name']} ({t['team']})": t['name'] for t in technicians}
-                selected = st.selectbox(
-                    "Select technician:",
-                    options=list(tech_options.keys()),
-                    key=f"assign_select_{request['id']}",
-                    label_visibility="collapsed"
-                )
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("✅ Assign", key=f"assign_btn_{request['id']}", use_container_width=True):
-                        request['assignedTo'] = tech_options[selected]
-                        if request['stage'] == 'New':
-                            request['stage'] = 'In Progress'
-                        st.success(f"Assigned to {tech_options[selected]}")
-                        st.rerun()
-        else:
-            st.info(f"Currently assigned to: **{request['assignedTo']}**")
-            if st.button("🔄 Reassign", key=f"reassign_{request['id']}", use_container_width=True):
-                request['assignedTo'] = None
-                st.rerun()
-        
+    if len(stage_requests) < total:
+        more = min(KANBAN_PAGE_SIZE, total - len(stage_requests))
+        if st.button(f"⬇️ Load {more} more", key=f"more_{stage}", use_container_width=True):
+            st.session_state.kanban_limits[stage] = limit + KANBAN_PAGE_SIZE
+            st.rerun()
+    
+    if limit > KANBAN_PAGE_SIZE:
+        if st.button("⬆️ Show fewer", key=f"fewer_{stage}", use_container_width=True):
+            st.session_state.kanban_limits[stage] = KANBAN_PAGE_SIZE
+            st.rerun()
+
+@profiled
+def render_open_card():
+    """Render the action panel for the opened card, if any"""
+    request = get_request_by_id(st.session_state.kanban_open_card)
+    if request is None:
+        return
+    
+    st.markdown("---")
+    col1, col2 = st.columns([5, 1])
+    with col1:
+        st.markdown(f"### 🔧 #{request['id']} {request['subject']}")
+        st.caption(f"{request['equipmentName']} · {request['stage']}")
+    with col2:
+        if st.button("✖️ Close", key="close_card", use_container_width=True):
+            st.session_state.kanban_open_card = None
+            st.rerun()
+    
+    render_card_actions(request, request['stage'])
+
+@profiled
+def render_card_actions(request, stage):
+    """Render the assignment, stage and duration controls for one card"""
+    # Show description if available
+    if request.get('description'):
+        st.markdown(f"**Description:** {request['description']}")
         st.markdown("---")
+    
+    # Assignment section
+    if not request['assignedTo']:
+        st.markdown("**Assign Technician:**")
+        tech_options = get_technician_options()
         
-        # Stage transition buttons
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            if stage == 'New' and st.button("▶️ Start Work", key=f"start_{request['id']}", use_container_width=True):
-                request['stage'] = 'In Progress'
-                st.rerun()
+        if tech_options:
+            selected = st.selectbox(
+                "Select technician:",
+                options=list(tech_options.keys()),
+                key=f"assign_select_{request['id']}",
+                label_visibility="collapsed"
+            )
             
-            if stage == 'In Progress':
-                if st.button("✅ Mark Repaired", key=f"repair_{request['id']}", use_container_width=True):
-                    request['stage'] = 'Repaired'
-                    if request['duration'] == 0:
-                        request['duration'] = 1  # Default duration
-                    st.success("Request completed!")
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("✅ Assign", key=f"assign_btn_{request['id']}", use_container_width=True):
+                    changes = {'assignedTo': tech_options[selected]}
+                    if request['stage'] == 'New':
+                        changes['stage'] = 'In Progress'
+                    update_request(request, **changes)
+                    st.success(f"Assigned to {tech_options[selected]}")
                     st.rerun()
-        
-        with col2:
-            if stage != 'Scrap':
-                if st.button("🗑️ Move to Scrap", key=f"scrap_{request['id']}", use_container_width=True):
-                    request['stage'] = 'Scrap'
-                    # Update equipment status
-                    equipment = get_equipment_by_id(request['equipmentId'])
-                    if equipment:
-                        equipment['status'] = 'Scrapped'
-                    st.warning("Equipment marked for scrap")
+            with col2:
+                if st.button("🤖 Auto-assign", key=f"auto_assign_{request['id']}", use_container_width=True):
+                    auto_assign([request])
                     st.rerun()
+    else:
+        st.info(f"Currently assigned to: **{request['assignedTo']}**")
+        if st.button("🔄 Reassign", key=f"reassign_{request['id']}", use_container_width=True):
+            update_request(request, assignedTo=None)
+            st.rerun()
+    
+    st.markdown("---")
+    
+    # Stage transition buttons
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if stage == 'New' and st.button("▶️ Start Work", key=f"start_{request['id']}", use_container_width=True):
+            update_request(request, stage='In Progress')
+            st.rerun()
         
-        # Duration input for completed work
-        if stage == 'In Progress' or stage == 'Repaired':
-            st.markdown("---")
-            duration = st.number_input(
-                "Work Duration (hours):",
-                min_value=0.0,
-                value=float(request.get('duration', 0)),
-                step=0.5,
-                key=f"duration_{request['id']}"
-            )
-            if st.button("💾 Save Duration", key=f"save_duration_{request['id']}", use_container_width=True):
-                request['duration'] = duration
-                st.success("Duration saved!")
+        if stage == 'In Progress':
+            if st.button("✅ Mark Repaired", key=f"repair_{request['id']}", use_container_width=True):
+                changes = {'stage': 'Repaired'}
+                if request['duration'] == 0:
+                    changes['duration'] = 1  # Default duration
+                update_request(request, **changes)
+                st.success("Request completed!")
+                st.rerun()
+    
+    with col2:
+        if stage != 'Scrap':
+            if st.button("🗑️ Move to Scrap", key=f"scrap_{request['id']}", use_container_width=True):
+                update_request(request, stage='Scrap')
+                # Update equipment status
+                equipment = get_equipment_by_id(request['equipmentId'])
+                if equipment:
+                    update_equipment(equipment, status='Scrapped')
+                st.warning("Equipment marked for scrap")
                 st.rerun()
+    
+    # Duration input for completed work
+    if stage == 'In Progress' or stage == 'Repaired':
+        st.markdown("---")
+        duration = st.number_input(
+            "Work Duration (hours):",
+            min_value=0.0,
+            value=float(request.get('duration', 0)),
+            step=0.5,
+            key=f"duration_{request['id']}"
+        )
+        if st.button("💾 Save Duration", key=f"save_duration_{request['id']}", use_container_width=True):
+            update_request(request, duration=duration)
+            st.success("Duration saved!")
+            st.rerun()
 
+@profiled
 def render_request_form():
     """Render the new request form"""
     st.markdown("## ➕ Create New Maintenance Request")
@@ -172,7 +267,7 @@ def render_request_form():
             subject = st.text_input("Subject *", placeholder="e.g., Oil Leak Detected")
             
             equipment_options = {eq['id']: f"{eq['name']} ({eq['serialNumber']})" 
-                               for eq in st.session_state.equipment}
+                               for eq in get_store().equipment}
             selected_eq_id = st.selectbox(
                 "Equipment *",
                 options=list(equipment_options.keys()),
@@ -196,16 +291,20 @@ def render_request_form():
                 st.text_input("Maintenance Team", value=selected_eq['maintenanceTeam'], disabled=True)
                 
                 # Option to assign technician
-                team_members = []
-                for team in st.session_state.teams:
-                    if team['name'] == selected_eq['maintenanceTeam']:
-                        team_members = team['members']
-                        break
+                team_members = get_team_members(selected_eq['maintenanceTeam'])
                 
                 assign_now = st.checkbox("Assign technician now?")
                 assigned_tech = None
+                auto_assign_tech = False
                 if assign_now and team_members:
-                    assigned_tech = st.selectbox("Technician", options=team_members)
+                    workload = get_workload()['technicians']
+                    assigned_tech = st.selectbox(
+                        "Technician",
+                        options=[None, *team_members],
+                        format_func=lambda m: "🤖 Auto-assign (least loaded)" if m is None
+                        else f"{m} · {workload.get(m, {}).get('active', 0)} active"
+                    )
+                    auto_assign_tech = assigned_tech is None
         
         description = st.text_area(
             "Description",
@@ -223,8 +322,10 @@ def render_request_form():
         
         if submit and subject and selected_eq_id:
             selected_eq = get_equipment_by_id(selected_eq_id)
+            if auto_assign_tech:
+                assigned_tech = pick_technician(selected_eq)
             new_request = {
-                'id': generate_next_id(st.session_state.requests),
+                'id': generate_next_id('requests'),
                 'subject': subject,
                 'equipmentId': selected_eq_id,
                 'equipmentName': selected_eq['name'],
@@ -239,7 +340,7 @@ def render_request_form():
                 'maintenanceTeam': selected_eq['maintenanceTeam'],
                 'description': description
             }
-            st.session_state.requests.append(new_request)
+            add_request(new_request)
             st.session_state.show_request_form = False
             st.success("✅ Request created successfully!")
             st.rerun()
@@ -250,8 +351,4 @@ def render_request_form():
 
 def format_date_display(date_str):
     """Format date for display"""
-    try:
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        return date_obj.strftime('%b %d, %Y')
-    except:
-        return date_str
+    return display_date(date_str)
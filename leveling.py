@@ -0,0 +1,156 @@
+"""
+Preventive schedule leveling for GearGuard Pro
+
+Proposes new dates for a team's not-yet-started preventive requests so
+that no day goes over the team's capacity in hours. Only tasks on days
+over capacity are moved, so a period that already fits is left alone.
+Each task may only move within LEVELING_WINDOW_DAYS of its current date
+and never before today. Other open work (corrective or already started
+requests, and occurrences of recurring schedules) counts towards each
+day's load but stays where it is.
+
+The optimizer is a greedy placement followed by local search:
+
+1. Greedy: the most constrained tasks go first. Each task stays on its
+   day if that day has room; otherwise it goes to the day in its window
+   that leaves the least overload.
+2. Local search: tasks on days still over capacity are moved to the day in
+   their window that lowers the cost most. The cost weighs squared overload
+   far above squared load, so among days with room the lightest wins. This
+   repeats until a pass finds no improving move, or for at most
+   LEVELING_MAX_PASSES passes.
+
+Each move is O(window days), so a quarter with 10k tasks levels in about a
+second.
+"""
+from dates import from_ordinal, today_ordinal
+from helpers import get_index, update_request
+from recurrence import get_projected_occurrences
+from settings import CLOSED_STAGES, DEFAULT_TASK_HOURS, LEVELING_MAX_PASSES, LEVELING_WINDOW_DAYS
+
+# How much more an hour over capacity costs than an hour of ordinary load
+OVERLOAD_WEIGHT = 100
+
+def task_hours(request):
+    """Estimated hours of a request, falling back to DEFAULT_TASK_HOURS"""
+    return request.get('duration') or DEFAULT_TASK_HOURS
+
+def _cost(load, capacity):
+    over = load - capacity
+    return load * load + (OVERLOAD_WEIGHT * over * over if over > 0 else 0)
+
+def level_schedule(tasks, base_load, capacity, max_passes=LEVELING_MAX_PASSES):
+    """
+    Choose a day for every task.
+
+    tasks is a list of (hours, earliest, latest, current) with days as
+    positions into base_load, the fixed hours already on each day. Returns
+    the chosen position for each task, in task order.
+    """
+    load = list(base_load)
+    days = [None] * len(tasks)
+
+    # Greedy placement, most constrained and longest tasks first
+    order = sorted(range(len(tasks)), key=lambda i: (tasks[i][2] - tasks[i][1], -tasks[i][0]))
+    for i in order:
+        hours, earliest, latest, current = tasks[i]
+        day = current
+        if load[current] + hours > capacity:
+            day = min(range(earliest, latest + 1),
+                      key=lambda d: (max(0, load[d] + hours - capacity), load[d], abs(d - current)))
+        days[i] = day
+        load[day] += hours
+
+    # Local search: move tasks off days over capacity while that lowers the cost
+    for _ in range(max_passes):
+        improved = False
+        crowded = [i for i in range(len(tasks)) if load[days[i]] > capacity]
+        for i in sorted(crowded, key=lambda i: -load[days[i]]):
+            hours, earliest, latest, current = tasks[i]
+            day = days[i]
+            if load[day] <= capacity:
+                continue
+            leave = _cost(load[day] - hours, capacity) - _cost(load[day], capacity)
+            best_day, best_delta = day, -1e-9
+            for candidate in range(earliest, latest + 1):
+                if candidate == day:
+                    continue
+                delta = leave + _cost(load[candidate] + hours, capacity) - _cost(load[candidate], capacity)
+                if delta < best_delta or (delta == best_delta and abs(candidate - current) < abs(best_day - current)):
+                    best_day, best_delta = candidate, delta
+            if best_day != day:
+                load[day] -= hours
+                load[best_day] += hours
+                days[i] = best_day
+                improved = True
+        if not improved:
+            break
+    return days
+
+def propose_leveling(team, start_day, end_day, capacity, window_days=LEVELING_WINDOW_DAYS):
+    """
+    Level one team's preventive work between two day ordinals (inclusive).
+
+    Returns a proposal dict with the first day, the capacity, the daily
+    load before and after (lists of hours, one per day) and the moves as
+    (request id, current day, proposed day) tuples.
+    """
+    start_day = max(start_day, today_ordinal())
+    size = max(end_day - start_day + 1, 0)
+    base_load = [0.0] * size
+    movable, tasks = [], []
+
+    for request in get_index().scheduled_between(start_day, end_day):
+        if request['maintenanceTeam'] != team or request['stage'] in CLOSED_STAGES:
+            continue
+        hours = task_hours(request)
+        position = request['scheduledDay'] - start_day
+        if request['type'] == 'Preventive' and request['stage'] == 'New':
+            movable.append(request)
+            tasks.append((hours, max(0, position - window_days), min(size - 1, position + window_days), position))
+        else:
+            base_load[position] += hours
+
+    for occurrence in get_projected_occurrences(start_day, end_day):
+        if occurrence['maintenanceTeam'] == team:
+            base_load[occurrence['scheduledDay'] - start_day] += task_hours(occurrence)
+
+    days = level_schedule(tasks, base_load, capacity)
+
+    before, after = list(base_load), list(base_load)
+    moves = []
+    for request, (hours, _, _, current), day in zip(movable, tasks, days):
+        before[current] += hours
+        after[day] += hours
+        if day != current:
+            moves.append((request['id'], start_day + current, start_day + day))
+
+    return {
+        'team': team,
+        'startDay': start_day,
+        'capacity': capacity,
+        'before': before,
+        'after': after,
+        'moves': moves,
+    }
+
+def overload_hours(load, capacity):
+    """Total hours scheduled above capacity across all days"""
+    return sum(max(hours - capacity, 0) for hours in load)
+
+def apply_leveling(proposal):
+    """
+    Reschedule the proposal's moves and return how many were applied.
+
+    A request that was started, finished or rescheduled since the proposal
+    was made is left alone.
+    """
+    index = get_index()
+    applied = 0
+    for request_id, current, day in proposal['moves']:
+        request = index.request_by_id.get(request_id)
+        if request is None or request['stage'] != 'New' or request['scheduledDay'] != current:
+            continue
+        update_request(request, scheduledDate=from_ordinal(day))
+        applied += 1
+    return applied
@@ -0,0 +1,212 @@
+"""
+Compact record model for GearGuard Pro
+
+Requests, equipment, teams and recurring schedules are stored as __slots__
+records instead of dicts. Records keep the dict-style access the views use
+(record['stage'], record.get('assignedTo')), so they are drop-in replacements. Stage, type
+and priority are str-based enums, so every record shares one object per
+value and comparisons against plain strings keep working.
+"""
+import sys
+import tracemalloc
+from enum import Enum
+
+class _StrEnum(str, Enum):
+    """String enum that formats, prints and compares as its value"""
+    __str__ = str.__str__
+    __format__ = str.__format__
+
+    @classmethod
+    def coerce(cls, value):
+        if value is None or isinstance(value, cls):
+            return value
+        return cls(value)
+
+class Stage(_StrEnum):
+    NEW = 'New'
+    IN_PROGRESS = 'In Progress'
+    REPAIRED = 'Repaired'
+    SCRAP = 'Scrap'
+
+class RequestType(_StrEnum):
+    CORRECTIVE = 'Corrective'
+    PREVENTIVE = 'Preventive'
+
+class Priority(_StrEnum):
+    HIGH = 'High'
+    MEDIUM = 'Medium'
+    LOW = 'Low'
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+class Record:
+    """Base for slotted records with dict-style access"""
+    __slots__ = ()
+    COERCE = {}
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            self[name] = fields.get(name)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a dict or sqlite3.Row, ignoring unknown keys"""
+        return cls(**{key: data[key] for key in data.keys() if key in cls.__slots__})
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        coerce = self.COERCE.get(key)
+        if coerce is not None:
+            value = coerce(value)
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __repr__(self):
+        return f"{type(self).__name__}(id={self['id']!r})"
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def keys(self):
+        return iter(self.__slots__)
+
+    def update(self, changes):
+        for key, value in changes.items():
+            self[key] = value
+
+    def to_dict(self):
+        """Plain dict copy with enums converted to their string values"""
+        return {
+            name: value.value if isinstance(value, Enum) else value
+            for name, value in ((name, getattr(self, name)) for name in self.__slots__)
+        }
+
+class Request(Record):
+    __slots__ = (
+        'id', 'subject', 'equipmentId', 'equipmentName', 'type', 'stage',
+        'scheduledDate', 'duration', 'assignedTo', 'createdDate', 'priority',
+        'category', 'maintenanceTeam', 'description', 'scheduledDay', 'createdDay'
+    )
+    COERCE = {
+        'stage': Stage.coerce,
+        'type': RequestType.coerce,
+        'priority': Priority.coerce,
+        'equipmentName': _intern,
+        'assignedTo': _intern,
+        'category': _intern,
+        'maintenanceTeam': _intern,
+        'scheduledDate': _intern,
+        'createdDate': _intern,
+    }
+
+class Equipment(Record):
+    __slots__ = (
+        'id', 'name', 'serialNumber', 'category', 'department', 'owner',
+        'purchaseDate', 'warranty', 'location', 'maintenanceTeam',
+        'defaultTechnician', 'status', 'purchaseDay', 'warrantyDay'
+    )
+    COERCE = {
+        'category': _intern,
+        'department': _intern,
+        'location': _intern,
+        'maintenanceTeam': _intern,
+        'defaultTechnician': _intern,
+        'status': _intern,
+    }
+
+class Team(Record):
+    __slots__ = ('id', 'name', 'members')
+    COERCE = {
+        'name': _intern,
+        'members': lambda members: [_intern(m) for m in members or []],
+    }
+
+class Schedule(Record):
+    __slots__ = (
+        'id', 'subject', 'equipmentId', 'frequency', 'interval', 'startDate',
+        'endDate', 'nextDate', 'startedDates', 'priority', 'assignedTo', 'autoAssign',
+        'duration', 'description', 'startDay', 'endDay', 'nextDay', 'startedDays'
+    )
+    COERCE = {
+        'startedDates': lambda dates: list(dates or []),
+        'priority': Priority.coerce,
+        'frequency': _intern,
+        'assignedTo': _intern,
+        'autoAssign': bool,
+    }
+
+def as_request(data):
+    return data if isinstance(data, Request) else Request.from_dict(data)
+
+def as_equipment(data):
+    return data if isinstance(data, Equipment) else Equipment.from_dict(data)
+
+def as_team(data):
+    return data if isinstance(data, Team) else Team.from_dict(data)
+
+def as_schedule(data):
+    return data if isinstance(data, Schedule) else Schedule.from_dict(data)
+
+def _sample_request_dict(i):
+    """A request dict shaped like the seed data, with per-record strings"""
+    day = 738000 + i % 900
+    return {
+        'id': i,
+        'subject': f'Work order {i}',
+        'equipmentId': i % 500,
+        'equipmentName': f'Machine {i % 500:03d}',
+        'type': ['Corrective', 'Preventive'][i % 2],
+        'stage': ['New', 'In Progress', 'Repaired', 'Scrap'][i % 4],
+        'scheduledDate': f'2024-{1 + i % 12:02d}-{1 + i % 28:02d}',
+        'duration': float(i % 8),
+        'assignedTo': f'Technician {i % 60}',
+        'createdDate': f'2024-{1 + i % 12:02d}-{1 + i % 28:02d}',
+        'priority': ['High', 'Medium', 'Low'][i % 3],
+        'category': ['Production', 'IT Equipment', 'Logistics'][i % 3],
+        'maintenanceTeam': ['Mechanics', 'Electricians', 'IT Support', 'HVAC Specialists'][i % 4],
+        'description': f'Description for work order {i}',
+        'scheduledDay': day,
+        'createdDay': day - 3,
+    }
+
+def compare_memory(count=100_000):
+    """
+    Measure memory held by count requests as dicts versus Request records.
+
+    Strings are rebuilt per record (as they would be when loaded from the
+    database) so the comparison includes the effect of interning.
+    """
+    def measure(build):
+        tracemalloc.start()
+        records = [build(_sample_request_dict(i)) for i in range(count)]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del records
+        return current
+
+    dict_bytes = measure(dict)
+    record_bytes = measure(Request.from_dict)
+    return {
+        'requests': count,
+        'dict_bytes': dict_bytes,
+        'record_bytes': record_bytes,
+        'saving': round(1 - record_bytes / dict_bytes, 3),
+    }
+
+if __name__ == '__main__':
+    result = compare_memory()
+    print(f"{result['requests']:,} requests")
+    print(f"  dict model:   {result['dict_bytes'] / 1e6:8.1f} MB")
+    print(f"  record model: {result['record_bytes'] / 1e6:8.1f} MB")
+    print(f"  saving:       {result['saving']:.1%}")
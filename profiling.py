@@ -0,0 +1,210 @@
+"""
+Opt-in rerun profiling for GearGuard Pro
+
+Set GEARGUARD_PROFILE=1 before starting Streamlit to enable it. View
+functions decorated with @profiled and blocks wrapped in profile_section()
+are timed on every rerun, st.markdown calls are counted and attributed to
+the innermost timed function, and a Performance panel appears in the
+sidebar with the last PROFILE_HISTORY reruns. The panel can also capture a
+cProfile dump of the next rerun.
+
+When profiling is off, @profiled returns the function unchanged and
+profile_section() is a no-op, so there is no per-call overhead.
+"""
+import cProfile
+import functools
+import io
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+import streamlit as st
+
+from settings import PROFILE_HISTORY
+from storage import get_database_path
+
+ENABLED = os.environ.get('GEARGUARD_PROFILE', '').lower() in ('1', 'true', 'yes', 'on')
+
+# Each Streamlit session reruns its script in its own thread
+_local = threading.local()
+_original_markdown = st.markdown
+
+class _Section:
+    """Times one call of a function or block within the current rerun"""
+    __slots__ = ('name', 'rerun', 'started')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.rerun = getattr(_local, 'rerun', None)
+        if self.rerun is not None:
+            self.rerun['stack'].append(self.name)
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.rerun is None:
+            return False
+        elapsed = time.perf_counter() - self.started
+        self.rerun['stack'].pop()
+        timing = _function_stats(self.rerun, self.name)
+        timing['calls'] += 1
+        timing['ms'] += elapsed * 1000
+        return False
+
+def _function_stats(rerun, name):
+    timing = rerun['functions'].get(name)
+    if timing is None:
+        timing = rerun['functions'][name] = {'calls': 0, 'ms': 0.0, 'markdown': 0}
+    return timing
+
+def _counting_markdown(*args, **kwargs):
+    rerun = getattr(_local, 'rerun', None)
+    if rerun is not None:
+        rerun['markdown'] += 1
+        name = rerun['stack'][-1] if rerun['stack'] else 'app'
+        _function_stats(rerun, name)['markdown'] += 1
+    return _original_markdown(*args, **kwargs)
+
+if ENABLED:
+    st.markdown = _counting_markdown
+
+def profiled(func):
+    """Time every call of a render function while profiling is enabled"""
+    if not ENABLED:
+        return func
+    name = f"{func.__module__}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _Section(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+def profile_section(name):
+    """Context manager timing a block of top-level script code"""
+    return _Section(name) if ENABLED else nullcontext()
+
+def begin_rerun():
+    """Start collecting timings for this rerun (see profile_rerun)"""
+    if not ENABLED:
+        return
+    _local.rerun = {
+        'started': datetime.now().strftime('%H:%M:%S'),
+        'clock': time.perf_counter(),
+        'stack': [],
+        'functions': {},
+        'markdown': 0,
+        'profiler': None,
+    }
+    if st.session_state.pop('_profile_capture', False):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # another profiler is already active in this thread
+            return
+        _local.rerun['profiler'] = profiler
+
+def end_rerun(view):
+    """Finish this rerun and add it to the session's history"""
+    rerun = getattr(_local, 'rerun', None)
+    if rerun is None:
+        return
+    _local.rerun = None
+    if rerun['profiler'] is not None:
+        rerun['profiler'].disable()
+
+    entry = {
+        'started': rerun['started'],
+        'view': view,
+        'total_ms': (time.perf_counter() - rerun['clock']) * 1000,
+        'markdown': rerun['markdown'],
+        'functions': rerun['functions'],
+    }
+    if rerun['profiler'] is not None:
+        entry['profile_path'], entry['profile_text'] = _dump_profile(rerun['profiler'])
+
+    history = st.session_state.get('_profile_history')
+    if history is None:
+        history = st.session_state['_profile_history'] = deque(maxlen=PROFILE_HISTORY)
+    history.appendleft(entry)
+
+@contextmanager
+def profile_rerun():
+    """
+    Time the script body as one rerun.
+
+    The rerun is recorded (and a cProfile capture stopped) in a finally
+    block, so reruns that end in st.rerun() show up in the history too;
+    Streamlit's rerun exception then propagates as usual.
+    """
+    begin_rerun()
+    try:
+        yield
+    finally:
+        end_rerun(st.session_state.get('current_view'))
+
+def _dump_profile(profiler):
+    """Write a .prof file next to the database; returns (path, top functions)"""
+    directory = get_database_path().parent / 'profiles'
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"rerun-{datetime.now():%Y%m%d-%H%M%S-%f}.prof"
+    profiler.dump_stats(path)
+
+    text = io.StringIO()
+    pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(25)
+    return str(path), text.getvalue()
+
+def render_panel():
+    """Sidebar panel listing recent reruns; only shown while profiling is enabled"""
+    if not ENABLED:
+        return
+    history = st.session_state.get('_profile_history') or []
+
+    with st.sidebar.expander("⏱️ Performance", expanded=False):
+        if st.button("Capture cProfile of next rerun", key="profile_capture", use_container_width=True):
+            st.session_state._profile_capture = True
+            st.rerun()
+
+        if not history:
+            st.caption("No reruns recorded yet.")
+            return
+
+        st.dataframe(
+            [
+                {'Time': r['started'], 'View': r['view'], 'ms': round(r['total_ms'], 1), 'markdown': r['markdown']}
+                for r in history
+            ],
+            hide_index=True,
+            use_container_width=True
+        )
+
+        choice = st.selectbox(
+            "Breakdown",
+            range(len(history)),
+            format_func=lambda i: f"{history[i]['started']} · {history[i]['view']} · {history[i]['total_ms']:.0f} ms",
+            key="profile_choice"
+        )
+        rerun = history[choice]
+        st.dataframe(
+            sorted(
+                (
+                    {'Function': name, 'Calls': t['calls'], 'ms': round(t['ms'], 1), 'markdown': t['markdown']}
+                    for name, t in rerun['functions'].items()
+                ),
+                key=lambda row: row['ms'],
+                reverse=True
+            ),
+            hide_index=True,
+            use_container_width=True
+        )
+        st.caption("Times are cumulative and include nested functions.")
+
+        if 'profile_path' in rerun:
+            st.caption(f"cProfile dump: {rerun['profile_path']}")
+            st.code(rerun['profile_text'], language=None)
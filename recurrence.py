@@ -0,0 +1,248 @@
+"""
+Recurring preventive maintenance for GearGuard Pro
+
+A recurring task is stored once, as a Schedule rule (frequency, interval,
+start and optional end date), not as a row per occurrence. Occurrences are
+expanded with dateutil.rrule only for the window being displayed, and an
+occurrence becomes a real request only when it falls due (the daily check)
+or someone starts it early, so thousands of rules never fill the request
+list with future rows.
+
+Each schedule's nextDate is its next occurrence that has not been turned
+into a request. Expansion starts from nextDate rather than the original
+start date, so the cost depends on the window, not on the rule's age.
+Later occurrences that were started early are kept in startedDates until
+nextDate moves past them. A schedule with autoAssign set has no fixed
+technician; each request it creates goes to whoever auto-assignment picks
+at that time.
+"""
+import threading
+from datetime import date, datetime
+
+from dateutil.rrule import DAILY, MONTHLY, WEEKLY, YEARLY, rrule
+
+from assignment import AssignmentPlanner
+from dates import from_ordinal, today_ordinal
+from helpers import add_request, add_schedule, get_equipment_by_id, update_schedule
+from storage import allocate_ids
+from store import get_store
+
+FREQUENCIES = {'Daily': DAILY, 'Weekly': WEEKLY, 'Monthly': MONTHLY, 'Yearly': YEARLY}
+
+_check_lock = threading.Lock()
+
+def build_rule(schedule, from_day=None):
+    """
+    The schedule's rrule, starting at from_day (an occurrence) or the start date.
+
+    Weekday, month day and month are pinned to the start date so a rule
+    restarted at any later occurrence keeps producing the same dates. A
+    month day past the 28th falls on the last day of shorter months (the
+    31st becomes Feb 28, Apr 30, ...) rather than skipping them.
+    """
+    start = date.fromordinal(schedule['startDay'])
+    freq = FREQUENCIES[schedule['frequency']]
+    pinned = {}
+    if freq == WEEKLY:
+        pinned['byweekday'] = start.weekday()
+    elif freq in (MONTHLY, YEARLY):
+        if freq == YEARLY:
+            pinned['bymonth'] = start.month
+        if start.day > 28:
+            # The latest of the 28th..start day that the month has
+            pinned['bymonthday'] = tuple(range(28, start.day + 1))
+            pinned['bysetpos'] = -1
+        else:
+            pinned['bymonthday'] = start.day
+    end_day = schedule.get('endDay')
+    return rrule(
+        freq,
+        interval=schedule.get('interval') or 1,
+        dtstart=datetime.fromordinal(from_day or schedule['startDay']),
+        until=datetime.fromordinal(end_day) if end_day is not None else None,
+        **pinned
+    )
+
+def occurrence_days(schedule, start_day, end_day):
+    """Day ordinals of the schedule's pending occurrences between start_day and end_day (inclusive)"""
+    next_day = schedule.get('nextDay')
+    if next_day is None or next_day > end_day:
+        return []
+    started = schedule.get('startedDays') or ()
+    rule = build_rule(schedule, next_day)
+    days = (dt.toordinal() for dt in rule.between(
+        datetime.fromordinal(max(start_day, next_day)), datetime.fromordinal(end_day), inc=True
+    ))
+    return [day for day in days if day not in started]
+
+def next_occurrence_after(schedule, day):
+    """The schedule's first pending occurrence after day, or None once the rule has ended"""
+    started = schedule.get('startedDays') or ()
+    for following in build_rule(schedule, schedule.get('nextDay')).xafter(datetime.fromordinal(day)):
+        if following.toordinal() not in started:
+            return following.toordinal()
+    return None
+
+def is_pending(schedule, day):
+    """Whether the occurrence on day has not been turned into a request yet"""
+    next_day = schedule.get('nextDay')
+    return next_day is not None and day >= next_day and day not in (schedule.get('startedDays') or ())
+
+def _advance(schedule, day):
+    """Move nextDate to the first pending occurrence after day and forget started days before it"""
+    following = next_occurrence_after(schedule, day)
+    started = [d for d in schedule.get('startedDates') or () if following is not None and d > from_ordinal(following)]
+    update_schedule(
+        schedule,
+        nextDate=from_ordinal(following) if following is not None else None,
+        startedDates=started,
+    )
+
+def _create(schedule, day, equipment, request_id=None, stage=None, planner=None):
+    # Request.from_dict drops the occurrence-only keys
+    request = occurrence(schedule, day, equipment)
+    request['id'] = request_id or allocate_ids('requests')[0]
+    if schedule.get('autoAssign') and not request['assignedTo']:
+        planner = planner or AssignmentPlanner()
+        request['assignedTo'] = planner.choose(
+            equipment['maintenanceTeam'], equipment.get('defaultTechnician'), request['duration']
+        )
+    request['stage'] = stage or ('In Progress' if request['assignedTo'] else 'New')
+    request['createdDate'] = from_ordinal(today_ordinal())
+    return add_request(request)
+
+def occurrence(schedule, day, equipment):
+    """A request-shaped dict for one occurrence that has not been created yet"""
+    return {
+        'id': None,
+        'scheduleId': schedule['id'],
+        'projected': True,
+        'subject': schedule['subject'],
+        'equipmentId': schedule['equipmentId'],
+        'equipmentName': equipment['name'],
+        'type': 'Preventive',
+        'stage': 'New',
+        'scheduledDate': from_ordinal(day),
+        'scheduledDay': day,
+        'duration': schedule.get('duration') or 0,
+        'assignedTo': schedule.get('assignedTo'),
+        'priority': schedule.get('priority'),
+        'category': equipment['category'],
+        'maintenanceTeam': equipment['maintenanceTeam'],
+        'description': schedule.get('description'),
+    }
+
+def get_projected_occurrences(start_day, end_day):
+    """Pending occurrences of every schedule between two day ordinals, by day (memoised per version)"""
+    store = get_store()
+    def build():
+        found = []
+        for schedule in list(store.schedules):
+            next_day = schedule.get('nextDay')
+            if next_day is None or next_day > end_day:
+                continue
+            equipment = get_equipment_by_id(schedule['equipmentId'])
+            if equipment is None:
+                continue
+            found.extend(occurrence(schedule, day, equipment)
+                         for day in occurrence_days(schedule, start_day, end_day))
+        found.sort(key=lambda o: (o['scheduledDay'], o['scheduleId']))
+        return found
+    return store.cached(('projected_occurrences', start_day, end_day), build)
+
+def create_schedule(subject, equipment_id, frequency, interval, start_day, end_day=None,
+                    priority='Medium', assigned_to=None, duration=0, description='', auto_assign=False):
+    """
+    Store a new recurring schedule; its first occurrence is the start date.
+
+    With auto_assign, assigned_to is ignored and every created request is
+    auto-assigned when it is created.
+    """
+    return add_schedule({
+        'id': allocate_ids('schedules')[0],
+        'subject': subject,
+        'equipmentId': equipment_id,
+        'frequency': frequency,
+        'interval': interval,
+        'startDate': from_ordinal(start_day),
+        'endDate': from_ordinal(end_day) if end_day is not None else None,
+        'nextDate': from_ordinal(start_day),
+        'priority': priority,
+        'assignedTo': None if auto_assign else assigned_to,
+        'autoAssign': auto_assign,
+        'duration': duration,
+        'description': description,
+    })
+
+def materialize(schedule, day, request_id=None, stage=None):
+    """
+    Turn the occurrence on day into a request; returns None if it already was one.
+
+    Only that occurrence is created. nextDate moves on when day is the next
+    occurrence; a later occurrence started early is added to startedDates so
+    the ones before it stay pending.
+    """
+    equipment = get_equipment_by_id(schedule['equipmentId'])
+    if equipment is None:
+        return None
+    # Checked again under the lock so "Start now" and the daily check cannot
+    # both create the same occurrence
+    with get_store().recurrence_lock:
+        if not is_pending(schedule, day):
+            return None
+        request = _create(schedule, day, equipment, request_id, stage)
+        if day == schedule['nextDay']:
+            _advance(schedule, day)
+        else:
+            update_schedule(schedule, startedDates=sorted([*schedule['startedDates'], from_ordinal(day)]))
+    return request
+
+def materialize_due(today=None, schedules=None):
+    """
+    Create a request for every schedule whose next occurrence is due.
+
+    Only the latest due occurrence of each schedule is created, so a rule
+    that was not checked for a while produces one request, not a backlog.
+    Returns the number of requests created.
+    """
+    today = today or today_ordinal()
+    if schedules is None:
+        schedules = get_store().schedules
+    store = get_store()
+    created = 0
+    with store.recurrence_lock:
+        due = []
+        for schedule in list(schedules):
+            next_day = schedule.get('nextDay')
+            if next_day is not None and next_day <= today:
+                days = occurrence_days(schedule, next_day, today)
+                equipment = get_equipment_by_id(schedule['equipmentId'])
+                # Equipment that no longer exists gets no request, but its
+                # schedule still moves on instead of coming back every day
+                due.append((schedule, days[-1] if days and equipment is not None else None, equipment))
+        count = sum(day is not None for _, day, _ in due)
+        request_ids = iter(allocate_ids('requests', count) if count else ())
+        # One planner for the batch, so each pick sees the ones before it
+        auto = any(schedule.get('autoAssign') for schedule, day, _ in due if day is not None)
+        planner = AssignmentPlanner() if auto else None
+
+        for schedule, day, equipment in due:
+            if day is not None:
+                _create(schedule, day, equipment, next(request_ids), planner=planner)
+                created += 1
+            # Missed occurrences up to today are covered by the latest one
+            _advance(schedule, today)
+    return created
+
+def run_daily_check(today=None):
+    """Materialize due occurrences at most once per day per process"""
+    store = get_store()
+    today = today or today_ordinal()
+    if store.recurrence_checked_day == today:
+        return 0
+    with _check_lock:
+        if store.recurrence_checked_day == today:
+            return 0
+        created = materialize_due(today)
+        store.recurrence_checked_day = today
+    return created
@@ -588,3 +588,48 @@ TYPE_COLORS = {
     'Corrective': '#ff6b6b',
     'Preventive': '#51cf66'
 }
+
+# Persistent storage (override with the GEARGUARD_DB environment variable)
+DATABASE_PATH = 'data/gearguard.db'
+
+# IDs reserved from the sequences table per database write
+ID_BLOCK_SIZE = 100
+
+# Stages that still need work
+OPEN_STAGES = ('New', 'In Progress')
+CLOSED_STAGES = ('Repaired', 'Scrap')
+
+# Cards shown per kanban column before "Load more"
+KANBAN_PAGE_SIZE = 20
+
+# Most points plotted on the analytics timeline before coarser buckets are used
+TIMELINE_MAX_POINTS = 400
+
+# Rows per page in the analytics report tables
+TABLE_PAGE_SIZE = 50
+
+# Rows written per chunk when exporting reports
+EXPORT_CHUNK_ROWS = 10_000
+
+# Number of journaled mutations between database snapshots
+SNAPSHOT_EVERY = 500
+
+# Reruns kept in the sidebar performance panel (GEARGUARD_PROFILE=1)
+PROFILE_HISTORY = 20
+
+# Extra open requests a default technician may carry over the least-loaded
+# team member before auto-assignment passes them over
+AUTO_ASSIGN_SLACK = 2
+
+# Hours assumed for a request without a duration estimate
+DEFAULT_TASK_HOURS = 2
+
+# Working hours per technician per day; a team's default daily capacity is
+# this times its member count
+TECHNICIAN_HOURS_PER_DAY = 8
+
+# Days a preventive task may move either side of its date when leveling
+LEVELING_WINDOW_DAYS = 3
+
+# Local-search passes over the schedule before leveling stops
+LEVELING_MAX_PASSES = 20
@@ -0,0 +1,74 @@
+"""
+Incrementally maintained request statistics for GearGuard Pro
+"""
+from collections import Counter
+
+from settings import OPEN_STAGES
+
+class RequestStats:
+    """
+    Running request counts by stage, type, priority, team, stage x team and
+    stage x technician, plus hours logged on repaired requests overall, per
+    team and per technician.
+
+    Counts are kept current with O(1) deltas: remove() a request before it
+    changes and add() it back afterwards.
+    """
+
+    def __init__(self, requests=()):
+        self.total = 0
+        self.by_stage = Counter()
+        self.by_type = Counter()
+        self.by_priority = Counter()
+        self.by_team = Counter()
+        self.by_stage_team = Counter()
+        self.by_stage_technician = Counter()
+        self.repaired_hours = 0.0
+        self.repaired_hours_by_team = Counter()
+        self.repaired_hours_by_technician = Counter()
+
+        for request in requests:
+            self.add(request)
+
+    def add(self, request):
+        self._apply(request, 1)
+
+    def remove(self, request):
+        self._apply(request, -1)
+
+    def _apply(self, request, delta):
+        stage = request['stage']
+        team = request.get('maintenanceTeam')
+        technician = request.get('assignedTo')
+        self.total += delta
+        self.by_stage[stage] += delta
+        self.by_type[request['type']] += delta
+        self.by_priority[request['priority']] += delta
+        self.by_team[team] += delta
+        self.by_stage_team[(stage, team)] += delta
+        self.by_stage_technician[(stage, technician)] += delta
+        if stage == 'Repaired':
+            hours = delta * (request.get('duration') or 0)
+            self.repaired_hours += hours
+            self.repaired_hours_by_team[team] += hours
+            self.repaired_hours_by_technician[technician] += hours
+
+    @property
+    def active(self):
+        """Requests still in an open stage"""
+        return sum(self.by_stage[stage] for stage in OPEN_STAGES)
+
+    def team_count(self, team, stages=None):
+        """Requests of one team, optionally restricted to the given stages"""
+        if stages is None:
+            return self.by_team[team]
+        return sum(self.by_stage_team[(stage, team)] for stage in stages)
+
+    def completion_rate(self):
+        """Percentage of all requests that are repaired"""
+        if self.total == 0:
+            return 0
+        return round((self.by_stage['Repaired'] / self.total) * 100, 1)
+
+    def average_repair_hours(self):
+        return round(self.repaired_hours / max(self.by_stage['Repaired'], 1), 1)
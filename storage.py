@@ -0,0 +1,307 @@
+"""
+SQLite persistence for GearGuard Pro
+"""
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from settings import DATABASE_PATH, ID_BLOCK_SIZE
+
+EQUIPMENT_COLUMNS = [
+    'id', 'name', 'serialNumber', 'category', 'department', 'owner',
+    'purchaseDate', 'warranty', 'location', 'maintenanceTeam',
+    'defaultTechnician', 'status'
+]
+
+TEAM_COLUMNS = ['id', 'name', 'members']
+
+REQUEST_COLUMNS = [
+    'id', 'subject', 'equipmentId', 'equipmentName', 'type', 'stage',
+    'scheduledDate', 'duration', 'assignedTo', 'createdDate', 'priority',
+    'category', 'maintenanceTeam', 'description'
+]
+
+SCHEDULE_COLUMNS = [
+    'id', 'subject', 'equipmentId', 'frequency', 'interval', 'startDate',
+    'endDate', 'nextDate', 'startedDates', 'priority', 'assignedTo', 'autoAssign',
+    'duration', 'description'
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS equipment (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    serialNumber TEXT,
+    category TEXT,
+    department TEXT,
+    owner TEXT,
+    purchaseDate TEXT,
+    warranty TEXT,
+    location TEXT,
+    maintenanceTeam TEXT,
+    defaultTechnician TEXT,
+    status TEXT
+);
+
+CREATE TABLE IF NOT EXISTS teams (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    members TEXT NOT NULL DEFAULT '[]'
+);
+
+CREATE TABLE IF NOT EXISTS requests (
+    id INTEGER PRIMARY KEY,
+    subject TEXT NOT NULL,
+    equipmentId INTEGER,
+    equipmentName TEXT,
+    type TEXT,
+    stage TEXT,
+    scheduledDate TEXT,
+    duration REAL DEFAULT 0,
+    assignedTo TEXT,
+    createdDate TEXT,
+    priority TEXT,
+    category TEXT,
+    maintenanceTeam TEXT,
+    description TEXT
+);
+
+CREATE TABLE IF NOT EXISTS schedules (
+    id INTEGER PRIMARY KEY,
+    subject TEXT NOT NULL,
+    equipmentId INTEGER,
+    frequency TEXT NOT NULL,
+    interval INTEGER NOT NULL DEFAULT 1,
+    startDate TEXT NOT NULL,
+    endDate TEXT,
+    nextDate TEXT,
+    startedDates TEXT NOT NULL DEFAULT '[]',
+    priority TEXT,
+    assignedTo TEXT,
+    autoAssign INTEGER NOT NULL DEFAULT 0,
+    duration REAL DEFAULT 0,
+    description TEXT
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS sequences (
+    name TEXT PRIMARY KEY,
+    next_id INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_requests_equipment ON requests (equipmentId, stage);
+CREATE INDEX IF NOT EXISTS idx_requests_stage ON requests (stage);
+CREATE INDEX IF NOT EXISTS idx_requests_scheduled ON requests (scheduledDate, stage);
+CREATE INDEX IF NOT EXISTS idx_requests_assigned ON requests (assignedTo, stage);
+CREATE INDEX IF NOT EXISTS idx_requests_team ON requests (maintenanceTeam, stage);
+CREATE INDEX IF NOT EXISTS idx_equipment_team ON equipment (maintenanceTeam);
+CREATE INDEX IF NOT EXISTS idx_teams_name ON teams (name);
+"""
+
+SEQUENCE_TABLES = {'requests': 'requests', 'equipment': 'equipment', 'teams': 'teams', 'schedules': 'schedules'}
+
+_connection = None
+_lock = threading.RLock()
+# Unused part of the last reserved block per sequence: name -> (next id, end)
+_id_blocks = {}
+
+def get_database_path():
+    """Resolve the database file, honouring the GEARGUARD_DB override"""
+    path = Path(os.environ.get('GEARGUARD_DB', DATABASE_PATH))
+    if not path.is_absolute():
+        path = Path(__file__).parent / path
+    return path
+
+def get_connection():
+    """Get the shared connection, creating the database on first use"""
+    global _connection
+    with _lock:
+        if _connection is None:
+            path = get_database_path()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            _connection = conn
+        return _connection
+
+def close_connection():
+    """Close the shared connection (used when switching databases)"""
+    global _connection
+    with _lock:
+        if _connection is not None:
+            _connection.close()
+            _connection = None
+        _id_blocks.clear()
+
+def _row_to_team(row, factory=dict):
+    team = dict(row)
+    team['members'] = json.loads(team['members'] or '[]')
+    return factory(team)
+
+def _team_to_row(team):
+    return (team['id'], team['name'], json.dumps(list(team['members'])))
+
+def _row_to_schedule(row, factory=dict):
+    schedule = dict(row)
+    schedule['startedDates'] = json.loads(schedule['startedDates'] or '[]')
+    schedule['autoAssign'] = bool(schedule['autoAssign'])
+    return factory(schedule)
+
+def _fetch(sql, params=(), factory=dict):
+    with _lock:
+        rows = get_connection().execute(sql, params).fetchall()
+    return [factory(row) for row in rows]
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+
+def load_equipment(factory=dict):
+    """Load all equipment ordered by ID, building each record with factory"""
+    return _fetch("SELECT * FROM equipment ORDER BY id", factory=factory)
+
+def load_teams(factory=dict):
+    """Load all teams ordered by ID, building each record with factory"""
+    with _lock:
+        rows = get_connection().execute("SELECT * FROM teams ORDER BY id").fetchall()
+    return [_row_to_team(row, factory) for row in rows]
+
+def load_requests(factory=dict):
+    """Load all maintenance requests ordered by ID, building each record with factory"""
+    return _fetch("SELECT * FROM requests ORDER BY id", factory=factory)
+
+def load_schedules(factory=dict):
+    """Load all recurring schedules ordered by ID, building each record with factory"""
+    with _lock:
+        rows = get_connection().execute("SELECT * FROM schedules ORDER BY id").fetchall()
+    return [_row_to_schedule(row, factory) for row in rows]
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+def _upsert_sql(table, columns):
+    placeholders = ', '.join('?' for _ in columns)
+    return f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+_EQUIPMENT_UPSERT = _upsert_sql('equipment', EQUIPMENT_COLUMNS)
+_TEAM_UPSERT = _upsert_sql('teams', TEAM_COLUMNS)
+_REQUEST_UPSERT = _upsert_sql('requests', REQUEST_COLUMNS)
+_SCHEDULE_UPSERT = _upsert_sql('schedules', SCHEDULE_COLUMNS)
+
+def _equipment_rows(equipment_list):
+    return [tuple(eq.get(col) for col in EQUIPMENT_COLUMNS) for eq in equipment_list]
+
+def _request_rows(requests):
+    return [tuple(r.get(col) for col in REQUEST_COLUMNS) for r in requests]
+
+def _schedule_rows(schedules):
+    return [
+        tuple(json.dumps(list(s.get(col) or [])) if col == 'startedDates' else s.get(col) for col in SCHEDULE_COLUMNS)
+        for s in schedules
+    ]
+
+def save_many_equipment(equipment_list):
+    """Insert or update equipment records in one transaction"""
+    with _lock:
+        conn = get_connection()
+        with conn:
+            conn.executemany(_EQUIPMENT_UPSERT, _equipment_rows(equipment_list))
+
+def save_many_teams(teams):
+    """Insert or update teams in one transaction"""
+    with _lock:
+        conn = get_connection()
+        with conn:
+            conn.executemany(_TEAM_UPSERT, [_team_to_row(team) for team in teams])
+
+def save_many_requests(requests):
+    """Insert or update maintenance requests in one transaction"""
+    with _lock:
+        conn = get_connection()
+        with conn:
+            conn.executemany(_REQUEST_UPSERT, _request_rows(requests))
+
+# ---------------------------------------------------------------------------
+# Snapshots
+# ---------------------------------------------------------------------------
+
+def get_journal_path():
+    """The mutation journal lives next to the database file"""
+    return get_database_path().with_suffix('.journal')
+
+def load_snapshot_seq():
+    """Journal sequence number already contained in the database"""
+    with _lock:
+        row = get_connection().execute(
+            "SELECT value FROM meta WHERE key = 'journal_seq'"
+        ).fetchone()
+    return int(row[0]) if row else 0
+
+def write_snapshot(equipment, teams, requests, journal_seq, schedules=()):
+    """
+    Write changed records and the journal position they cover in a single
+    transaction, so a crash leaves either the old or the new snapshot
+    """
+    with _lock:
+        conn = get_connection()
+        with conn:
+            conn.executemany(_EQUIPMENT_UPSERT, _equipment_rows(equipment))
+            conn.executemany(_TEAM_UPSERT, [_team_to_row(team) for team in teams])
+            conn.executemany(_REQUEST_UPSERT, _request_rows(requests))
+            conn.executemany(_SCHEDULE_UPSERT, _schedule_rows(schedules))
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('journal_seq', ?)",
+                (str(journal_seq),)
+            )
+
+# ---------------------------------------------------------------------------
+# ID sequences
+# ---------------------------------------------------------------------------
+
+def allocate_ids(name, count=1):
+    """
+    Reserve count consecutive IDs for an entity and return them as a range.
+
+    IDs are handed out from a block of at least ID_BLOCK_SIZE reserved in
+    the sequences table, so most creates never touch the database. The
+    counter is advanced inside an IMMEDIATE transaction, so IDs are unique
+    across threads and processes and are never reused after a restart; the
+    unused rest of a block is skipped instead.
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    with _lock:
+        next_id, end = _id_blocks.get(name, (0, 0))
+        if end - next_id < count:
+            next_id, end = _reserve_block(name, max(count, ID_BLOCK_SIZE))
+        _id_blocks[name] = (next_id + count, end)
+    return range(next_id, next_id + count)
+
+def _reserve_block(name, size):
+    table = SEQUENCE_TABLES[name]
+    with _lock:
+        conn = get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT next_id FROM sequences WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                first = conn.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}").fetchone()[0]
+                conn.execute("INSERT INTO sequences (name, next_id) VALUES (?, ?)", (name, first + size))
+            else:
+                first = row[0]
+                conn.execute("UPDATE sequences SET next_id = ? WHERE name = ?", (first + size, name))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return first, first + size
@@ -0,0 +1,196 @@
+"""
+Process-wide data store shared by all GearGuard Pro sessions
+"""
+import threading
+
+import streamlit as st
+
+from dates import attach_equipment_dates, attach_request_dates, attach_schedule_dates
+from indexes import DataIndex
+from journal import Journal
+from models import Equipment, Request, Schedule, Team
+from sample_data import sample_equipment, sample_teams, sample_requests
+from settings import SNAPSHOT_EVERY
+from stats import RequestStats
+from storage import (
+    EQUIPMENT_COLUMNS,
+    REQUEST_COLUMNS,
+    SCHEDULE_COLUMNS,
+    TEAM_COLUMNS,
+    get_journal_path,
+    load_equipment,
+    load_teams,
+    load_requests,
+    load_schedules,
+    load_snapshot_seq,
+    save_many_equipment,
+    save_many_teams,
+    save_many_requests,
+    write_snapshot
+)
+
+ENTITY_COLUMNS = {
+    'equipment': EQUIPMENT_COLUMNS,
+    'teams': TEAM_COLUMNS,
+    'requests': REQUEST_COLUMNS,
+    'schedules': SCHEDULE_COLUMNS,
+}
+
+ENTITY_MODELS = {
+    'equipment': Equipment,
+    'teams': Team,
+    'requests': Request,
+    'schedules': Schedule,
+}
+
+class DataStore:
+    """
+    Equipment, teams, requests and recurring schedules plus their indexes
+    and statistics.
+
+    One instance is shared by every browser session. Writers hold the lock
+    of the entity they change (requests_lock, equipment_lock, teams_lock,
+    schedules_lock) so a kanban move does not block someone adding a team.
+
+    Mutations are appended to the journal and the changed IDs remembered
+    in dirty; compact() writes those records to the database snapshot.
+
+    version increases with every mutation. cached() memoises derived data
+    (aggregates, figures, tables) until the next one.
+    """
+
+    def __init__(self, equipment, teams, requests, journal=None, schedules=None):
+        self.equipment = equipment
+        self.teams = teams
+        self.requests = requests
+        self.schedules = schedules if schedules is not None else []
+        self.index = DataIndex(equipment, teams, requests, self.schedules)
+        self.stats = RequestStats(requests)
+        self.journal = journal
+        self.dirty = {entity: set() for entity in ENTITY_COLUMNS}
+        self.version = 0
+        # (version, {key: value}); replaced wholesale when the version moves on
+        self._cache = (self.version, {})
+        # Day ordinal of the last recurring-schedule check, and the lock that
+        # makes turning an occurrence into a request happen once (see recurrence.py)
+        self.recurrence_checked_day = None
+        self.recurrence_lock = threading.RLock()
+
+        self.requests_lock = threading.RLock()
+        self.equipment_lock = threading.RLock()
+        self.teams_lock = threading.RLock()
+        self.schedules_lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._version_lock = threading.Lock()
+
+    def record(self, entity, op, record, changes=None):
+        """Journal an 'add' or 'update'; the caller holds the entity's lock"""
+        with self._version_lock:
+            self.version += 1
+        self.dirty[entity].add(record['id'])
+        if self.journal is None:
+            return
+        columns = ENTITY_COLUMNS[entity]
+        if op == 'add':
+            data = {col: record.get(col) for col in columns}
+        else:
+            data = {key: value for key, value in changes.items() if key in columns}
+        self.journal.append(op, entity, record['id'], data)
+
+    def cached(self, key, build):
+        """Return build() memoised under key until the data version changes"""
+        version = self.version
+        cache_version, entries = self._cache
+        if cache_version != version:
+            # Everything memoised so far belongs to an older version
+            entries = {}
+            self._cache = (version, entries)
+        if key in entries:
+            return entries[key]
+        value = entries[key] = build()
+        return value
+
+    def maybe_compact(self):
+        """Snapshot once enough events have accumulated (call without entity locks held)"""
+        if self.journal is not None and self.journal.pending >= SNAPSHOT_EVERY:
+            self.compact()
+
+    def compact(self):
+        """Write changed records to the database and truncate the journal"""
+        with self._compact_lock, self.requests_lock, self.equipment_lock, self.teams_lock, self.schedules_lock:
+            if self.journal is None or not self.journal.pending:
+                return
+            team_ids = self.dirty['teams']
+            write_snapshot(
+                [self.index.equipment_by_id[i] for i in self.dirty['equipment']],
+                [team for team in self.teams if team['id'] in team_ids],
+                [self.index.request_by_id[i] for i in self.dirty['requests']],
+                self.journal.seq,
+                [self.index.schedule_by_id[i] for i in self.dirty['schedules']]
+            )
+            self.journal.truncate()
+            for ids in self.dirty.values():
+                ids.clear()
+
+def replay_journal(events, equipment, teams, requests, schedules=None):
+    """Apply journaled events to freshly loaded records; returns the IDs touched"""
+    records = {'equipment': equipment, 'teams': teams, 'requests': requests,
+               'schedules': schedules if schedules is not None else []}
+    by_id = {entity: {r['id']: r for r in items} for entity, items in records.items()}
+    dirty = {entity: set() for entity in records}
+
+    for event in events:
+        entity, record_id = event['entity'], event['id']
+        existing = by_id[entity].get(record_id)
+        if existing is not None:
+            existing.update(event['data'])
+        elif event['op'] == 'add':
+            record = ENTITY_MODELS[entity].from_dict(event['data'])
+            records[entity].append(record)
+            by_id[entity][record_id] = record
+        else:
+            continue
+        dirty[entity].add(record_id)
+
+    return dirty
+
+def load_store():
+    """
+    Load the database snapshot, seeding sample data on first run, and replay
+    the journal events recorded after it
+    """
+    equipment = load_equipment(Equipment.from_dict)
+    if not equipment:
+        equipment = [Equipment.from_dict(eq) for eq in sample_equipment()]
+        save_many_equipment(equipment)
+
+    teams = load_teams(Team.from_dict)
+    if not teams:
+        teams = [Team.from_dict(team) for team in sample_teams()]
+        save_many_teams(teams)
+
+    requests = load_requests(Request.from_dict)
+    if not requests:
+        requests = [Request.from_dict(r) for r in sample_requests()]
+        save_many_requests(requests)
+
+    schedules = load_schedules(Schedule.from_dict)
+
+    snapshot_seq = load_snapshot_seq()
+    journal = Journal(get_journal_path(), start_seq=snapshot_seq)
+    dirty = replay_journal(journal.events(after_seq=snapshot_seq), equipment, teams, requests, schedules)
+
+    store = DataStore(
+        [attach_equipment_dates(eq) for eq in equipment],
+        teams,
+        [attach_request_dates(r) for r in requests],
+        journal,
+        [attach_schedule_dates(schedule) for schedule in schedules]
+    )
+    store.dirty = dirty
+    return store
+
+@st.cache_resource(show_spinner="Loading maintenance data...")
+def get_store():
+    """Get the shared store, loading it once per server process"""
+    return load_store()
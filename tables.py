@@ -0,0 +1,152 @@
+"""
+Server-side paginated tables for GearGuard Pro
+
+Filtering, sorting and paging happen on the cached DataFrames from
+frames.py; only the visible page is passed to st.dataframe, so the browser
+receives TABLE_PAGE_SIZE rows however large the history grows. The sort
+order of the full frame is cached per data version and column, so paging
+and filtering do not re-sort.
+"""
+from datetime import date
+
+import streamlit as st
+
+from frames import get_equipment_frame, get_request_frame
+from settings import TABLE_PAGE_SIZE
+from store import get_store
+
+# Columns are (frame column, label, frame column to sort by)
+REQUEST_COLUMNS = [
+    ('id', 'ID', 'id'),
+    ('subject', 'Subject', 'subject'),
+    ('equipmentName', 'Equipment', 'equipmentName'),
+    ('type', 'Type', 'type'),
+    ('stage', 'Stage', 'stage'),
+    ('priority', 'Priority', 'priority'),
+    ('scheduledDate', 'Scheduled', 'scheduledDay'),
+    ('assignedTo', 'Assigned To', 'assignedTo'),
+    ('maintenanceTeam', 'Team', 'maintenanceTeam'),
+]
+
+# Filters are (frame column, label, kind): 'multiselect' over a categorical
+# column or 'date_range' over a day-ordinal column
+REQUEST_FILTERS = [
+    ('stage', 'Stage', 'multiselect'),
+    ('maintenanceTeam', 'Team', 'multiselect'),
+    ('priority', 'Priority', 'multiselect'),
+    ('scheduledDay', 'Scheduled between', 'date_range'),
+]
+
+EQUIPMENT_COLUMNS = [
+    ('id', 'ID', 'id'),
+    ('name', 'Name', 'name'),
+    ('serialNumber', 'Serial Number', 'serialNumber'),
+    ('category', 'Category', 'category'),
+    ('department', 'Department', 'department'),
+    ('location', 'Location', 'location'),
+    ('maintenanceTeam', 'Team', 'maintenanceTeam'),
+    ('status', 'Status', 'status'),
+    ('warranty', 'Warranty Until', 'warrantyDay'),
+]
+
+EQUIPMENT_FILTERS = [
+    ('category', 'Category', 'multiselect'),
+    ('maintenanceTeam', 'Team', 'multiselect'),
+    ('status', 'Status', 'multiselect'),
+    ('warrantyDay', 'Warranty ends between', 'date_range'),
+]
+
+def _order(frame, column, descending):
+    ordered = frame[column].sort_values(ascending=not descending, kind='stable', na_position='last')
+    return ordered.index.to_numpy()
+
+def sorted_positions(key, frame, column, descending):
+    """Row positions of frame ordered by column (memoised per data version)"""
+    cached_frame, positions = get_store().cached(
+        ('table_order', key, column, descending),
+        lambda: (frame, _order(frame, column, descending))
+    )
+    # A mutation between fetching the frame and sorting it can leave an
+    # order for a different frame under the current version
+    if cached_frame is not frame:
+        positions = _order(frame, column, descending)
+    return positions
+
+def _day_bounds(key, frame, column):
+    def build():
+        days = frame[column].dropna()
+        if days.empty:
+            return None
+        return date.fromordinal(int(days.min())), date.fromordinal(int(days.max()))
+    return get_store().cached(('table_bounds', key, column), build)
+
+def render_filters(key, frame, filters):
+    """Render filter widgets and return a boolean row mask (None when unfiltered)"""
+    mask = None
+    cols = st.columns(len(filters))
+    for col, (column, label, kind) in zip(cols, filters):
+        with col:
+            if kind == 'date_range':
+                bounds = _day_bounds(key, frame, column)
+                if bounds is None:
+                    continue
+                picked = st.date_input(label, value=bounds, min_value=bounds[0], max_value=bounds[1],
+                                       key=f"{key}_filter_{column}")
+                if len(picked) != 2 or tuple(picked) == bounds:
+                    continue
+                days = frame[column].to_numpy()
+                condition = (days >= picked[0].toordinal()) & (days <= picked[1].toordinal())
+            else:
+                selected = st.multiselect(label, list(frame[column].cat.categories), key=f"{key}_filter_{column}")
+                if not selected:
+                    continue
+                condition = frame[column].isin(selected).to_numpy()
+            mask = condition if mask is None else mask & condition
+    return mask
+
+def render_table(key, frame, columns, filters, height=400):
+    """Render a filterable, sortable table that only serializes the current page"""
+    mask = render_filters(key, frame, filters)
+
+    labels = [label for _, label, _ in columns]
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        sort_label = st.selectbox("Sort by", labels, key=f"{key}_sort")
+    with col2:
+        descending = st.toggle("Descending", key=f"{key}_desc")
+    
+    sort_by = next(sort for _, label, sort in columns if label == sort_label)
+    positions = sorted_positions(key, frame, sort_by, descending)
+    if mask is not None:
+        positions = positions[mask[positions]]
+    
+    total = len(positions)
+    pages = max(1, -(-total // TABLE_PAGE_SIZE))
+    page_key = f"{key}_page"
+    # The widget takes its value from session state only, so seed and clamp it first
+    if page_key not in st.session_state:
+        st.session_state[page_key] = 1
+    elif st.session_state[page_key] > pages:
+        st.session_state[page_key] = pages
+    with col3:
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+    
+    # Only the visible rows are converted and sent to the browser
+    start = (page - 1) * TABLE_PAGE_SIZE
+    visible = frame.iloc[positions[start:start + TABLE_PAGE_SIZE]]
+    page_frame = visible[[source for source, _, _ in columns]].astype(object)
+    page_frame.columns = labels
+    
+    st.dataframe(page_frame, use_container_width=True, height=height, hide_index=True)
+    if total:
+        st.caption(f"Rows {start + 1:,}–{start + len(page_frame):,} of {total:,} · page {page} of {pages}")
+    else:
+        st.caption("No rows match the current filters.")
+
+def render_requests_table():
+    """All requests, filterable by stage, team, priority and scheduled date"""
+    render_table('requests_table', get_request_frame(), REQUEST_COLUMNS, REQUEST_FILTERS)
+
+def render_equipment_table():
+    """All equipment, filterable by category, team, status and warranty end"""
+    render_table('equipment_table', get_equipment_frame(), EQUIPMENT_COLUMNS, EQUIPMENT_FILTERS)
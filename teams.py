@@ -2,8 +2,13 @@
 Teams Management View for GearGuard Pro
 """
 import streamlit as st
-from helpers import get_requests_by_team, generate_next_id
+from helpers import get_index, get_stats, get_team_by_name, generate_next_id, add_team, update_team
+from settings import OPEN_STAGES
+from profiling import profiled
+from store import get_store
+from workload import get_recent_completed, team_workload, technician_workload
 
+@profiled
 def render():
     """Render the teams management view"""
     
@@ -15,60 +20,63 @@ def render():
     with col2:
         if st.button("➕ Add Team", use_container_width=True):
             st.session_state.show_team_form = True
+            st.session_state.edit_team = None
     
     st.markdown("---")
     
     # Show form if requested
     if st.session_state.get('show_team_form', False):
-        render_team_form()
+        render_team_form(get_team_by_name(st.session_state.get('edit_team')))
         return
     
     # Team overview stats
+    teams = get_store().teams
     st.markdown("### 📊 Team Overview")
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Teams", len(st.session_state.teams))
+        st.metric("Total Teams", len(teams))
     
     with col2:
-        total_members = sum(len(team['members']) for team in st.session_state.teams)
+        total_members = sum(len(team['members']) for team in teams)
         st.metric("Total Technicians", total_members)
     
     with col3:
-        active_requests = len([r for r in st.session_state.requests 
-                              if r['stage'] in ['New', 'In Progress']])
+        active_requests = get_stats().active
         st.metric("Active Requests", active_requests)
     
     with col4:
-        avg_per_team = round(active_requests / len(st.session_state.teams), 1) if st.session_state.teams else 0
+        avg_per_team = round(active_requests / len(teams), 1) if teams else 0
         st.metric("Avg Requests/Team", avg_per_team)
     
     st.markdown("---")
     
     # Display teams in a grid
     cols = st.columns(3)
-    for idx, team in enumerate(st.session_state.teams):
+    for idx, team in enumerate(teams):
         with cols[idx % 3]:
             render_team_card(team)
 
+@profiled
 def render_team_card(team):
     """Render a single team card"""
     
     # Get team workload
-    team_requests = get_requests_by_team(team['name'])
-    active_requests = [r for r in team_requests if r['stage'] in ['New', 'In Progress']]
-    completed_requests = [r for r in team_requests if r['stage'] == 'Repaired']
+    workload = team_workload(team['name'])
+    active_count = workload['active']
+    completed_count = workload['completed']
+    team_total = active_count + completed_count
     
     # Calculate completion rate
     completion_rate = 0
-    if team_requests:
-        completion_rate = round((len(completed_requests) / len(team_requests)) * 100, 1)
+    if team_total:
+        completion_rate = round((completed_count / team_total) * 100, 1)
     
     # Workload indicator
     workload_color = "#51cf66"  # Green - Low
-    if len(active_requests) > 5:
+    if active_count > 5:
         workload_color = "#ff6b6b"  # Red - High
-    elif len(active_requests) > 2:
+    elif active_count > 2:
         workload_color = "#ffd43b"  # Yellow - Medium
     
     st.markdown(f"""
@@ -98,11 +106,11 @@ def render_team_card(team):
                     border-radius: 12px;
                     font-weight: 700;
                     font-size: 0.85rem;
-                ">{len(active_requests)}</span>
+                ">{active_count}</span>
             </div>
             <div style="display: flex; justify-content: space-between; margin-bottom: 0.5rem;">
                 <span style="color: #64748b; font-size: 0.85rem;">Completed</span>
-                <span style="font-weight: 600; color: #1a1a2e;">{len(completed_requests)}</span>
+                <span style="font-weight: 600; color: #1a1a2e;">{completed_count}</span>
             </div>
             <div style="display: flex; justify-content: space-between;">
                 <span style="color: #64748b; font-size: 0.85rem;">Completion Rate</span>
@@ -123,14 +131,12 @@ def render_team_card(team):
     """, unsafe_allow_html=True)
     
     for member in team['members']:
-        # Count member's active tasks
-        member_tasks = [r for r in st.session_state.requests 
-                       if r.get('assignedTo') == member and r['stage'] in ['New', 'In Progress']]
+        member_active = technician_workload(member)['active']
         
         st.markdown(f"""
-        <div class="member-badge" title="{len(member_tasks)} active task(s)">
+        <div class="member-badge" title="{member_active} active task(s)">
             {member}
-            {f" ({len(member_tasks)})" if member_tasks else ""}
+            {f" ({member_active})" if member_active else ""}
         </div>
         """, unsafe_allow_html=True)
     
@@ -140,8 +146,14 @@ def render_team_card(team):
     </div>
     """, unsafe_allow_html=True)
     
+    if st.button("✏️ Edit Members", key=f"edit_team_{team['id']}", use_container_width=True):
+        st.session_state.show_team_form = True
+        st.session_state.edit_team = team['name']
+        st.rerun()
+    
     # Expandable section for detailed workload
     with st.expander(f"📋 View Team Workload", expanded=False):
+        active_requests = get_index().requests_in_stages('maintenanceTeam', team['name'], OPEN_STAGES) if active_count else []
         if active_requests:
             st.markdown("**Active Requests:**")
             for request in active_requests:
@@ -185,10 +197,11 @@ def render_team_card(team):
         else:
             st.info("No active requests for this team.")
         
-        if completed_requests:
+        recent_completed = get_recent_completed(3).get(team['name'])
+        if recent_completed:
             st.markdown("---")
-            st.markdown(f"**Recently Completed:** (Last {min(3, len(completed_requests))})")
-            for request in sorted(completed_requests, key=lambda x: x.get('scheduledDate', ''), reverse=True)[:3]:
+            st.markdown(f"**Recently Completed:** (Last {len(recent_completed)})")
+            for request in recent_completed:
                 st.markdown(f"""
                 <div style='
                     background: #f0fdf4;
@@ -204,19 +217,23 @@ def render_team_card(team):
                 </div>
                 """, unsafe_allow_html=True)
 
-def render_team_form():
-    """Render the add team form"""
-    st.markdown("## ➕ Add New Team")
+@profiled
+def render_team_form(team=None):
+    """Render the add team form, or the member editor when a team is given"""
+    st.markdown(f"## ✏️ Edit {team['name']}" if team else "## ➕ Add New Team")
     
     with st.form("team_form", clear_on_submit=True):
         team_name = st.text_input(
             "Team Name *",
-            placeholder="e.g., Mechanics, Electricians, IT Support"
+            value=team['name'] if team else "",
+            placeholder="e.g., Mechanics, Electricians, IT Support",
+            disabled=team is not None
         )
         
         st.markdown("**Team Members** *(one per line)*")
         members = st.text_area(
             "Members *",
+            value="\n".join(team['members']) if team else "",
             placeholder="John Doe\nJane Smith\nRobert Wilson",
             height=150,
             label_visibility="collapsed"
@@ -228,7 +245,7 @@ def render_team_form():
         col1, col2, col3 = st.columns([1, 1, 2])
         
         with col1:
-            submit = st.form_submit_button("✅ Add Team", use_container_width=True)
+            submit = st.form_submit_button("✅ Save Team" if team else "✅ Add Team", use_container_width=True)
         with col2:
             cancel = st.form_submit_button("❌ Cancel", use_container_width=True)
         
@@ -240,21 +257,29 @@ def render_team_form():
                 st.error("Please add at least one team member.")
                 return
             
+            if team:
+                update_team(team, members=member_list)
+                st.session_state.show_team_form = False
+                st.session_state.edit_team = None
+                st.success(f"✅ Team '{team['name']}' now has {len(member_list)} member(s)!")
+                st.rerun()
+            
             # Check for duplicate team name
-            if any(t['name'].lower() == team_name.lower() for t in st.session_state.teams):
+            if any(t['name'].lower() == team_name.lower() for t in get_store().teams):
                 st.error(f"A team with the name '{team_name}' already exists.")
                 return
             
             new_team = {
-                'id': generate_next_id(st.session_state.teams),
+                'id': generate_next_id('teams'),
                 'name': team_name,
                 'members': member_list
             }
-            st.session_state.teams.append(new_team)
+            add_team(new_team)
             st.session_state.show_team_form = False
             st.success(f"✅ Team '{team_name}' added with {len(member_list)} member(s)!")
             st.rerun()
         
         if cancel:
             st.session_state.show_team_form = False
+            st.session_state.edit_team = None
             st.rerun()
@@ -0,0 +1,45 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The modules live in the repository root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import storage
+from helpers import add_equipment, add_team, generate_next_id
+from store import get_store
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """A fresh shared store backed by a database in tmp_path, seeded with the sample data"""
+    monkeypatch.setenv('GEARGUARD_DB', str(tmp_path / 'gearguard.db'))
+    storage.close_connection()
+    get_store.clear()
+    store = get_store()
+    yield store
+    store.journal.close()
+    get_store.clear()
+    storage.close_connection()
+
+@pytest.fixture
+def add_crew(store):
+    """Factory adding a team plus one piece of equipment it maintains; returns the equipment"""
+    return _add_crew
+
+def _add_crew(name, members):
+    add_team({'id': generate_next_id('teams'), 'name': name, 'members': list(members)})
+    return add_equipment({
+        'id': generate_next_id('equipment'),
+        'name': f"{name} Rig",
+        'serialNumber': f"{name[:3].upper()}-001",
+        'category': 'Production',
+        'department': 'Production',
+        'owner': 'Factory Floor',
+        'purchaseDate': '2024-01-01',
+        'warranty': '2027-01-01',
+        'location': 'Test Bay',
+        'maintenanceTeam': name,
+        'defaultTechnician': members[0] if members else None,
+        'status': 'Operational',
+    })
@@ -0,0 +1,90 @@
+from datetime import date
+
+from assignment import AssignmentPlanner, auto_assign, get_unassigned_backlog, pick_technician, rebalance_backlog
+from helpers import add_request, generate_next_id
+from recurrence import create_schedule, materialize_due
+from settings import AUTO_ASSIGN_SLACK
+
+def open_request(equipment, assigned_to=None, duration=0, stage=None):
+    return add_request({
+        'id': generate_next_id('requests'),
+        'subject': 'Check',
+        'equipmentId': equipment['id'],
+        'equipmentName': equipment['name'],
+        'type': 'Corrective',
+        'stage': stage or ('In Progress' if assigned_to else 'New'),
+        'scheduledDate': '2026-04-01',
+        'duration': duration,
+        'assignedTo': assigned_to,
+        'createdDate': '2026-03-30',
+        'priority': 'Medium',
+        'category': equipment['category'],
+        'maintenanceTeam': equipment['maintenanceTeam'],
+        'description': '',
+    })
+
+def test_least_loaded_orders_by_open_count_then_hours(add_crew):
+    rig = add_crew('Crew', ['Ann', 'Bob', 'Cid'])
+    open_request(rig, 'Ann', duration=2)
+    open_request(rig, 'Bob', duration=4)
+    open_request(rig, 'Cid', duration=1)
+    assert AssignmentPlanner().least_loaded('Crew') == 'Cid'
+
+def test_least_loaded_of_empty_team_is_none(add_crew):
+    add_crew('Nobody', [])
+    assert AssignmentPlanner().least_loaded('Nobody') is None
+
+def test_choose_keeps_default_technician_within_slack(add_crew):
+    rig = add_crew('Crew', ['Ann', 'Bob'])
+    for _ in range(AUTO_ASSIGN_SLACK):
+        open_request(rig, 'Ann')
+    assert pick_technician(rig) == 'Ann'
+
+    open_request(rig, 'Ann')
+    assert pick_technician(rig) == 'Bob'
+
+def test_choose_spreads_a_batch_evenly(add_crew):
+    add_crew('Crew', ['Ann', 'Bob', 'Cid'])
+    planner = AssignmentPlanner()
+    picks = [planner.choose('Crew', hours=2) for _ in range(6)]
+    assert sorted(picks) == ['Ann', 'Ann', 'Bob', 'Bob', 'Cid', 'Cid']
+    assert planner.loads['Ann'] == (2, 4)
+
+def test_choose_sees_load_added_through_another_team(add_crew):
+    add_crew('Crew', ['Ann', 'Bob'])
+    add_crew('Night', ['Bob', 'Dee'])
+    planner = AssignmentPlanner()
+    assert planner.least_loaded('Crew') == 'Ann'
+    planner.choose('Crew', 'Ann')
+    planner.choose('Night', 'Bob')
+    planner.choose('Night', 'Bob')
+    assert planner.least_loaded('Crew') == 'Ann'
+
+def test_rebalance_assigns_the_whole_backlog(add_crew):
+    rig = add_crew('Crew', ['Ann', 'Bob'])
+    backlog = [open_request(rig) for _ in range(4)]
+    assert set(r['id'] for r in backlog) <= set(r['id'] for r in get_unassigned_backlog())
+
+    assert rebalance_backlog() >= len(backlog)
+    # Ann is the rig's default technician and keeps work up to the slack
+    assert sorted(r['assignedTo'] for r in backlog) == ['Ann'] * (AUTO_ASSIGN_SLACK + 1) + ['Bob']
+    assert all(r['stage'] == 'In Progress' for r in backlog)
+    assert get_unassigned_backlog() == []
+
+def test_auto_assign_skips_teams_without_members(add_crew):
+    rig = add_crew('Nobody', [])
+    request = open_request(rig)
+    assert auto_assign([request]) == 0
+    assert request['assignedTo'] is None and request['stage'] == 'New'
+
+def test_recurring_schedule_assigns_each_request_when_created(add_crew, store):
+    rig = add_crew('Crew', ['Ann', 'Bob'])
+    for _ in range(AUTO_ASSIGN_SLACK + 1):
+        open_request(rig, 'Ann')
+    start = date(2026, 4, 6).toordinal()
+    schedule = create_schedule('Lube', rig['id'], 'Daily', 1, start, duration=3, auto_assign=True)
+    assert schedule['assignedTo'] is None and schedule['autoAssign']
+
+    assert materialize_due(today=start, schedules=[schedule]) == 1
+    created = store.requests[-1]
+    assert (created['assignedTo'], created['stage'], created['duration']) == ('Bob', 'In Progress', 3)
@@ -0,0 +1,105 @@
+from helpers import add_request, generate_next_id, update_request
+from journal import Journal
+from models import Request
+from settings import ID_BLOCK_SIZE
+from store import load_store, replay_journal
+import storage
+
+def new_request(subject):
+    return {
+        'id': generate_next_id('requests'),
+        'subject': subject,
+        'equipmentId': 1,
+        'equipmentName': 'CNC Machine 01',
+        'type': 'Corrective',
+        'stage': 'New',
+        'scheduledDate': '2026-03-02',
+        'duration': 0,
+        'assignedTo': None,
+        'createdDate': '2026-03-01',
+        'priority': 'High',
+        'category': 'Production',
+        'maintenanceTeam': 'Mechanics',
+        'description': '',
+    }
+
+def test_journal_numbers_events_and_resumes(tmp_path):
+    path = tmp_path / 'events.journal'
+    journal = Journal(path)
+    assert journal.append('add', 'teams', 1, {'name': 'A'}) == 1
+    assert journal.append('update', 'teams', 1, {'name': 'B'}) == 2
+    journal.close()
+
+    reopened = Journal(path, start_seq=1)
+    assert (reopened.seq, reopened.pending) == (2, 1)
+    assert [e['data'] for e in reopened.events(after_seq=1)] == [{'name': 'B'}]
+    reopened.truncate()
+    assert list(reopened.events()) == [] and reopened.pending == 0
+    reopened.close()
+
+def test_journal_skips_torn_final_line(tmp_path):
+    path = tmp_path / 'events.journal'
+    journal = Journal(path)
+    journal.append('add', 'teams', 1, {'name': 'A'})
+    journal.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"seq":2,"op":"upd')
+
+    reopened = Journal(path)
+    assert reopened.seq == 1
+    assert reopened.append('add', 'teams', 2, {'name': 'B'}) == 2
+    reopened.close()
+    assert [e['id'] for e in Journal(path).events()] == [1, 2]
+
+def test_replay_applies_adds_and_updates():
+    requests = [Request.from_dict({'id': 1, 'subject': 'Old', 'stage': 'New'})]
+    events = [
+        {'seq': 1, 'op': 'update', 'entity': 'requests', 'id': 1, 'data': {'stage': 'Repaired'}},
+        {'seq': 2, 'op': 'add', 'entity': 'requests', 'id': 2, 'data': {'id': 2, 'subject': 'New', 'stage': 'New'}},
+        {'seq': 3, 'op': 'update', 'entity': 'requests', 'id': 9, 'data': {'stage': 'Scrap'}},
+    ]
+    dirty = replay_journal(events, [], [], requests)
+
+    assert [(r['id'], r['subject'], r['stage']) for r in requests] == [(1, 'Old', 'Repaired'), (2, 'New', 'New')]
+    assert dirty['requests'] == {1, 2}
+
+def test_store_replays_journal_after_restart(store):
+    request = add_request(new_request('Leaking valve'))
+    update_request(request, stage='In Progress', assignedTo='John Doe')
+    store.journal.close()
+
+    reloaded = load_store()
+    found = reloaded.index.request_by_id[request['id']]
+    assert (found['stage'], found['assignedTo']) == ('In Progress', 'John Doe')
+    assert reloaded.dirty['requests'] == {request['id']}
+    reloaded.journal.close()
+
+def test_compact_writes_snapshot_and_truncates(store):
+    request = add_request(new_request('Worn belt'))
+    update_request(request, stage='Repaired', duration=2)
+    store.compact()
+
+    assert store.journal.pending == 0 and list(store.journal.events()) == []
+    assert storage.load_snapshot_seq() == store.journal.seq
+    assert not any(store.dirty.values())
+    store.journal.close()
+
+    reloaded = load_store()
+    found = reloaded.index.request_by_id[request['id']]
+    assert (found['stage'], found['duration']) == ('Repaired', 2)
+    reloaded.journal.close()
+
+def test_allocated_ids_are_not_reused_after_restart(store):
+    highest = max(r['id'] for r in store.requests)
+    first = storage.allocate_ids('requests', 3)
+    assert list(first) == [highest + 1, highest + 2, highest + 3]
+    assert generate_next_id('requests') == highest + 4
+
+    # A restart skips the rest of the reserved block rather than reusing it
+    storage.close_connection()
+    assert generate_next_id('requests') == highest + 1 + ID_BLOCK_SIZE
+
+def test_bulk_allocation_larger_than_a_block(store):
+    ids = storage.allocate_ids('teams', ID_BLOCK_SIZE * 2)
+    assert len(ids) == ID_BLOCK_SIZE * 2
+    assert generate_next_id('teams') == ids[-1] + 1
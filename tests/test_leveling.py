@@ -0,0 +1,53 @@
+import random
+
+from leveling import level_schedule, overload_hours
+
+def window(position, size, days=3):
+    return max(0, position - days), min(size - 1, position + days)
+
+def tasks_at(positions, hours, size):
+    return [(hours, *window(p, size), p) for p in positions]
+
+def loads(tasks, days, base_load):
+    load = list(base_load)
+    for (hours, _, _, _), day in zip(tasks, days):
+        load[day] += hours
+    return load
+
+def test_schedule_within_capacity_is_left_alone():
+    # 7 two-hour tasks at 16 h/day: nothing is over capacity, so nothing moves
+    tasks = tasks_at([0, 0, 1, 2, 2, 3, 5], 2, 10)
+    days = level_schedule(tasks, [0] * 10, 16)
+    assert days == [task[3] for task in tasks]
+
+def test_overloaded_day_is_spread_within_the_window():
+    tasks = tasks_at([4] * 12, 2, 10)
+    days = level_schedule(tasks, [0] * 10, 8)
+    assert all(1 <= day <= 7 for day in days)
+    assert overload_hours(loads(tasks, days, [0] * 10), 8) == 0
+
+def test_fixed_load_counts_towards_capacity():
+    base_load = [0, 8, 0]
+    tasks = [(2, 0, 2, 1), (2, 0, 2, 1)]
+    days = level_schedule(tasks, base_load, 8)
+    assert 1 not in days
+    assert overload_hours(loads(tasks, days, base_load), 8) == 0
+
+def test_tasks_never_leave_their_window():
+    tasks = [(4, 2, 2, 2)] * 3
+    days = level_schedule(tasks, [0] * 5, 8)
+    assert days == [2, 2, 2]
+
+def test_busy_quarter_with_room_ends_without_overload():
+    # Hot spots on three days, but each window has enough spare hours
+    rng = random.Random(7)
+    size, capacity = 90, 24
+    tasks = []
+    for _ in range(200):
+        position = rng.choice([rng.randrange(size), 10, 45, 80])
+        tasks.append((rng.choice([1, 2, 4]), *window(position, size), position))
+    assert overload_hours(loads(tasks, [task[3] for task in tasks], [0] * size), capacity) > 0
+
+    days = level_schedule(tasks, [0] * size, capacity)
+    assert all(earliest <= day <= latest for (_, earliest, latest, _), day in zip(tasks, days))
+    assert overload_hours(loads(tasks, days, [0] * size), capacity) == 0
@@ -0,0 +1,120 @@
+from datetime import date, datetime
+
+from dates import attach_schedule_dates
+from helpers import generate_next_id
+from models import Schedule
+from recurrence import (
+    build_rule,
+    create_schedule,
+    get_projected_occurrences,
+    materialize,
+    materialize_due,
+    occurrence_days,
+    run_daily_check
+)
+
+def day(year, month, dom):
+    return date(year, month, dom).toordinal()
+
+def rule_dates(schedule, count, from_day=None):
+    return [dt.date() for dt in build_rule(schedule, from_day)[:count]]
+
+def schedule(frequency, start, interval=1, end=None):
+    """An unsaved schedule, for the pure rule functions"""
+    return attach_schedule_dates(Schedule.from_dict({
+        'id': 1,
+        'frequency': frequency,
+        'interval': interval,
+        'startDate': start,
+        'endDate': end,
+        'nextDate': start,
+    }))
+
+def test_weekly_rule_restarted_at_later_occurrence_keeps_dates():
+    rule = schedule('Weekly', '2026-03-04', interval=2)
+    dates = rule_dates(rule, 5)
+    assert all(d.weekday() == 2 for d in dates)
+    assert rule_dates(rule, 3, from_day=dates[2].toordinal()) == dates[2:]
+
+def test_monthly_on_the_31st_falls_on_month_end():
+    rule = schedule('Monthly', '2026-01-31')
+    assert rule_dates(rule, 4) == [date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31), date(2026, 4, 30)]
+    # Restarting at the clamped February date goes back to the 31st
+    assert rule_dates(rule, 2, from_day=day(2026, 2, 28)) == [date(2026, 2, 28), date(2026, 3, 31)]
+
+def test_monthly_on_the_30th_in_a_leap_year():
+    rule = schedule('Monthly', '2028-01-30')
+    assert rule_dates(rule, 3) == [date(2028, 1, 30), date(2028, 2, 29), date(2028, 3, 30)]
+
+def test_yearly_on_leap_day_falls_on_feb_28():
+    rule = schedule('Yearly', '2028-02-29')
+    assert rule_dates(rule, 3) == [date(2028, 2, 29), date(2029, 2, 28), date(2030, 2, 28)]
+
+def test_until_is_inclusive():
+    rule = schedule('Daily', '2026-05-01', end='2026-05-03')
+    assert [d.day for d in rule_dates(rule, 10)] == [1, 2, 3]
+    assert occurrence_days(rule, day(2026, 5, 2), day(2026, 5, 31)) == [day(2026, 5, 2), day(2026, 5, 3)]
+    assert build_rule(rule).after(datetime(2026, 5, 3)) is None
+
+def test_occurrence_days_start_from_next_date():
+    rule = schedule('Weekly', '2026-03-02')
+    rule['nextDate'] = '2026-03-16'
+    attach_schedule_dates(rule)
+    assert occurrence_days(rule, day(2026, 3, 1), day(2026, 3, 31)) == [
+        day(2026, 3, 16), day(2026, 3, 23), day(2026, 3, 30)
+    ]
+
+def test_materialize_due_creates_only_the_latest_due_occurrence(store):
+    weekly = create_schedule('Grease bearings', 1, 'Weekly', 1, day(2026, 3, 2))
+    before = len(store.requests)
+
+    assert materialize_due(today=day(2026, 3, 25), schedules=[weekly]) == 1
+    assert len(store.requests) == before + 1
+    assert store.requests[-1]['scheduledDate'] == '2026-03-23'
+    assert weekly['nextDate'] == '2026-03-30'
+    assert materialize_due(today=day(2026, 3, 25), schedules=[weekly]) == 0
+
+def test_materialize_due_at_month_end(store):
+    monthly = create_schedule('Check pressure', 1, 'Monthly', 1, day(2026, 1, 31))
+    assert materialize_due(today=day(2026, 2, 28), schedules=[monthly]) == 1
+    assert store.requests[-1]['scheduledDate'] == '2026-02-28'
+    assert monthly['nextDate'] == '2026-03-31'
+
+def test_materialize_due_ends_with_the_rule(store):
+    daily = create_schedule('Walkdown', 1, 'Daily', 1, day(2026, 5, 1), end_day=day(2026, 5, 3))
+    assert materialize_due(today=day(2026, 5, 10), schedules=[daily]) == 1
+    assert store.requests[-1]['scheduledDate'] == '2026-05-03'
+    assert daily['nextDate'] is None
+    assert materialize_due(today=day(2026, 5, 11), schedules=[daily]) == 0
+
+def test_materialize_due_moves_on_when_the_equipment_is_gone(store):
+    orphan = create_schedule('Inspect hoist', 9999, 'Weekly', 1, day(2026, 3, 2))
+    last_id = generate_next_id('requests')
+
+    assert materialize_due(today=day(2026, 3, 25), schedules=[orphan]) == 0
+    assert orphan['nextDate'] == '2026-03-30'
+    assert generate_next_id('requests') == last_id + 1
+
+def test_starting_a_later_occurrence_keeps_earlier_ones_pending(store):
+    weekly = create_schedule('Inspect guards', 1, 'Weekly', 1, day(2030, 1, 7))
+    third = day(2030, 1, 21)
+
+    started = materialize(weekly, third, stage='In Progress')
+    assert started['scheduledDay'] == third and started['stage'] == 'In Progress'
+    assert weekly['nextDate'] == '2030-01-07'
+    assert weekly['startedDates'] == ['2030-01-21']
+    assert materialize(weekly, third) is None
+
+    projected = [o['scheduledDay'] for o in get_projected_occurrences(day(2030, 1, 1), day(2030, 1, 31))]
+    assert projected == [day(2030, 1, 7), day(2030, 1, 14), day(2030, 1, 28)]
+
+    materialize(weekly, day(2030, 1, 7))
+    materialize(weekly, day(2030, 1, 14))
+    assert weekly['nextDate'] == '2030-01-28'
+    assert weekly['startedDates'] == []
+
+def test_daily_check_runs_once_per_day(store):
+    create_schedule('Walkdown', 1, 'Daily', 1, day(2026, 6, 1))
+    store.recurrence_checked_day = None
+    assert run_daily_check(today=day(2026, 6, 2)) == 1
+    assert run_daily_check(today=day(2026, 6, 2)) == 0
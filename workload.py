@@ -0,0 +1,81 @@
+"""
+Team and technician workload for GearGuard Pro
+
+One pass over the open-stage buckets counts new and in-progress requests
+and their estimated hours (scheduledHours) per team and per technician;
+completed counts and repaired hours come from the running stats. The cost
+therefore grows with open work and roster size, not with history. The
+result is built once per store version and shared by the team cards, the
+kanban technician pickers and auto-assignment.
+"""
+from collections import defaultdict
+
+from settings import OPEN_STAGES
+from store import get_store
+
+# Workload field for each open stage
+STAGE_FIELDS = {'New': 'new', 'In Progress': 'inProgress'}
+
+def _blank():
+    return {'active': 0, 'new': 0, 'inProgress': 0, 'completed': 0, 'hours': 0.0, 'scheduledHours': 0.0}
+
+def build_workload(store):
+    """{'teams': {name: workload}, 'technicians': {name: workload}} for every team and member"""
+    index, stats = store.index, store.stats
+    teams = defaultdict(_blank)
+    technicians = defaultdict(_blank)
+
+    for stage in OPEN_STAGES:
+        field = STAGE_FIELDS[stage]
+        for request_id in index.ids('stage', stage):
+            request = index.request_by_id[request_id]
+            hours = request.get('duration') or 0
+            for entry in (teams[request.get('maintenanceTeam')], technicians[request.get('assignedTo')]):
+                entry[field] += 1
+                entry['active'] += 1
+                entry['scheduledHours'] += hours
+
+    for team_name, members in index.roster().team_members.items():
+        entry = teams[team_name]
+        entry['completed'] = stats.by_stage_team[('Repaired', team_name)]
+        entry['hours'] = stats.repaired_hours_by_team[team_name]
+        for member in members:
+            entry = technicians[member]
+            entry['completed'] = stats.by_stage_technician[('Repaired', member)]
+            entry['hours'] = stats.repaired_hours_by_technician[member]
+
+    return {'teams': dict(teams), 'technicians': dict(technicians)}
+
+def get_workload():
+    """The workload for the current data version"""
+    store = get_store()
+    return store.cached('workload', lambda: build_workload(store))
+
+def team_workload(team_name):
+    """Workload of one team (zeros for a team without requests)"""
+    return get_workload()['teams'].get(team_name) or _blank()
+
+def technician_workload(technician):
+    """Workload of one technician (zeros for a technician without requests)"""
+    return get_workload()['technicians'].get(technician) or _blank()
+
+def get_technician_options():
+    """Assignment picker labels mapped to technician names (memoised per version)"""
+    store = get_store()
+    def build():
+        technicians = get_workload()['technicians']
+        options = {}
+        for t in store.index.roster().options:
+            active = technicians.get(t['name'], {}).get('active', 0)
+            options[f"{t['name']} ({t['team']}) · {active} active"] = t['name']
+        return options
+    return store.cached('technician_options', build)
+
+def get_recent_completed(limit=3):
+    """Up to limit most recently scheduled repaired requests per team (memoised per version)"""
+    store = get_store()
+    def build():
+        wanted = {team['name']: min(limit, team_workload(team['name'])['completed'])
+                  for team in list(store.teams)}
+        return store.index.latest_in_stage('Repaired', 'maintenanceTeam', wanted)
+    return store.cached(('recent_completed', limit), build)